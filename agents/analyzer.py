@@ -14,73 +14,59 @@ Uses Claude Agent SDK which requires:
 
 import asyncio
 import os
+from typing import TYPE_CHECKING, List, Optional
 
-from claude_agent_sdk import (
-    AssistantMessage,
-    ClaudeAgentOptions,
-    ClaudeSDKClient,
-    TextBlock,
-    create_sdk_mcp_server,
-    tool,
-)
 from rich.console import Console
 
-from agents.mcp_tools import TOOLS
-from core.database import Database
-from core.profile_manager import ProfileManager
+from agents.mcp_tools import TOOLS, profile_mgr
+from agents.sdk_tools import NVM_NODE_BIN, build_sdk_tools, iter_text
+from core.config import load_config
+
+# SDK imports are deferred (see agents/sdk_tools.py)
+if TYPE_CHECKING:
+    from claude_agent_sdk import ClaudeSDKClient
+
+    from core.profile_manager import ProfileManager
 
 console = Console()
 
-# Tools available for analyzer agent (7 tools - minimal write access)
+# Persistent analyzer client - started on first use and reused by every
+# run_analysis() call in this process, so the CLI subprocess spawn and
+# handshake are only paid once. Closed via close_analyzer_client().
+_client: Optional["ClaudeSDKClient"] = None
+_client_lock = asyncio.Lock()
+
+# Tools available for analyzer agent (8 tools - minimal write access)
 ANALYZER_TOOLS = [
     'get_articles',
     'get_article',
     'get_profile',
     'get_stats',
-    'save_article_analysis',  # PRIMARY tool for saving analysis
+    'analyze_unread_batch',  # PRIMARY tool - analyzes and saves a whole batch
+    'save_article_analyses',  # Bulk fallback for articles the batch could not analyze
     'trigger_deep_analysis',
     'save_deep_analysis'
 ]
 
+# Fail at import (not first run) if a tool name has no TOOLS entry
+_unknown_tools = set(ANALYZER_TOOLS) - TOOLS.keys()
+if _unknown_tools:
+    raise ValueError(f"Unknown tools in ANALYZER_TOOLS: {sorted(_unknown_tools)}")
+
+ALLOWED_TOOLS = tuple(f"mcp__news_tools__{tool_name}" for tool_name in ANALYZER_TOOLS)
 
 def create_mcp_server():
     """Create MCP server with analyzer tools."""
-    sdk_tools = []
-
-    for tool_name in ANALYZER_TOOLS:
-        tool_info = TOOLS[tool_name]
-
-        def make_tool_wrapper(name, func, desc, params):
-            input_schema = params if params else {}
-
-            @tool(name, desc, input_schema)
-            async def wrapper(args):
-                console.print(f"[dim]🔧 {name}[/dim]")
-                result = func(args)
-                import json
-                result_json = json.dumps(result, ensure_ascii=False, indent=2)
-                return {
-                    "content": [
-                        {"type": "text", "text": result_json}
-                    ]
-                }
-            return wrapper
-
-        sdk_tools.append(make_tool_wrapper(
-            tool_name,
-            tool_info['function'],
-            tool_info['description'],
-            tool_info['parameters']
-        ))
+    from claude_agent_sdk import create_sdk_mcp_server
 
     return create_sdk_mcp_server(
         name="news_tools",
         version="1.0.0",
-        tools=sdk_tools
+        tools=build_sdk_tools(ANALYZER_TOOLS)
     )
 
 
-def get_system_prompt(profile: ProfileManager) -> str:
+def get_system_prompt(profile: "ProfileManager") -> str:
     """Get system prompt for analyzer agent."""
     profile_data = profile.get_profile()
     top_topics = profile.get_top_topics(5)
@@ -96,21 +82,22 @@ DIN UPPGIFT:
 Analysera ALLA olästa artiklar i systemet. Detta är en autonom bakgrundsuppgift.
 
 VIKTIGA VERKTYG:
-- get_articles: Hämta artiklar för analys
-- get_article: Hämta fullständig artikel för djupanalys
+- analyze_unread_batch: Analysera + spara en hel batch oanalyserade artiklar i ETT anrop (PRIMÄRT VERKTYG!)
+- get_articles: Hämta artiklar
+- get_article: Hämta fullständig artikel för djupanalys eller manuell analys
 - get_profile: Hämta användarprofil
 - get_stats: Hämta statistik
-- save_article_analysis: Spara sammanfattning + relevanspoäng (PRIMÄRT VERKTYG!)
+- save_article_analyses: Spara sammanfattningar + relevanspoäng för FLERA artiklar i ETT anrop (endast för failed_ids)
 - trigger_deep_analysis: Hämta djupanalysprompt (steg 1/2)
 - save_deep_analysis: Spara djupanalysresultat (steg 2/2)
 
 ANALYSPROCESS:
-1. Använd get_articles(read_status='unread', limit=1000) för att hämta ALLA olästa artiklar
-2. För VARJE artikel:
-   - Analysera för relevans (0.0-1.0) baserat på användarprofil
-   - Skapa koncis svensk sammanfattning (2-3 meningar)
-   - SPARA med save_article_analysis(article_id, summary, relevance_score)
-3. För artiklar från källor med deep_analysis=true (t.ex. Cornucopia):
+1. Anropa analyze_unread_batch(max_articles=100) upprepade gånger tills remaining_unanalyzed är 0
+   (avbryt om analyzed_count blir 0 - då återstår bara failed_ids)
+2. För artiklar i failed_ids:
+   - Hämta med get_article(article_id), analysera själv (relevans 0.0-1.0 + 2-3 meningars svensk sammanfattning)
+   - Samla resultaten och SPARA med save_article_analyses(items) i omgångar om högst 100
+3. För artiklar i deep_analysis_ids (källor med deep_analysis=true, t.ex. Cornucopia):
    - Anropa trigger_deep_analysis(article_id) → få prompt
    - Exekvera prompten (skapa djupanalys)
    - Anropa save_deep_analysis(article_id, analysis_text) → spara
@@ -129,37 +116,26 @@ När du är klar, ge en kort sammanfattning:
 
 def create_analyzer_client():
     """Create and configure an analyzer agent client (reusable across interfaces)."""
+    from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
     from dotenv import load_dotenv
     _ = load_dotenv()
 
-    db = Database()
-    profile = ProfileManager(db=db)
-
     # Load model from config
-    import json
-    try:
-        with open('config.json', 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        model = config.get('claude_model', 'claude-haiku-4-5-20251001')
-    except (FileNotFoundError, json.JSONDecodeError):
-        model = 'claude-haiku-4-5-20251001'  # Default fallback
+    model = load_config().get('claude_model', 'claude-haiku-4-5-20251001')
 
     # Create MCP server
     mcp_server = create_mcp_server()
 
-    # Setup options
-    allowed_tools = [f"mcp__news_tools__{tool_name}" for tool_name in ANALYZER_TOOLS]
-
     # NVM-specific configuration
     subprocess_env = os.environ.copy()
-    subprocess_env["PATH"] = f"/Users/mikaelsjovind/.nvm/versions/node/v22.15.1/bin:{subprocess_env.get('PATH', '')}"
+    subprocess_env["PATH"] = f"{NVM_NODE_BIN}:{subprocess_env.get('PATH', '')}"
 
     options = ClaudeAgentOptions(
         mcp_servers={"news_tools": mcp_server},
-        allowed_tools=allowed_tools,
-        system_prompt=get_system_prompt(profile),
+        allowed_tools=list(ALLOWED_TOOLS),
+        system_prompt=get_system_prompt(profile_mgr),
         permission_mode='bypassPermissions',
-        cli_path="/Users/mikaelsjovind/.nvm/versions/node/v22.15.1/bin/claude",
+        cli_path=f"{NVM_NODE_BIN}/claude",
         env=subprocess_env,
         model=model
     )
@@ -167,56 +143,86 @@ def create_analyzer_client():
     return ClaudeSDKClient(options=options)
 
 
-async def run_analysis():
-    """Run autonomous analysis (CLI interface)."""
+async def get_analyzer_client() -> "ClaudeSDKClient":
+    """Get the shared analyzer client, connecting it on first use."""
+    global _client
+    async with _client_lock:
+        if _client is None:
+            client = create_analyzer_client()
+            await client.connect()
+            _client = client
+            console.print(f"[green]✓[/green] Loaded {len(ANALYZER_TOOLS)} tools")
+        return _client
+
+
+async def close_analyzer_client() -> None:
+    """Disconnect the shared analyzer client (call once on shutdown)."""
+    global _client
+    async with _client_lock:
+        if _client is not None:
+            client, _client = _client, None
+            await client.disconnect()
+
+
+async def run_analysis(deep_analysis_ids: Optional[List[int]] = None):
+    """
+    Run autonomous analysis (CLI interface).
+
+    Args:
+        deep_analysis_ids: Articles already scored elsewhere (e.g. by the ingestion
+            pipeline) that still need deep analysis
+    """
     console.print("[bold blue]Starting autonomous analysis...[/bold blue]")
 
-    client = create_analyzer_client()
-    console.print(f"[green]✓[/green] Loaded {len(ANALYZER_TOOLS)} tools")
+    client = await get_analyzer_client()
 
-    # Create client and run analysis
-    async with client:
-        # Send analysis task
-        analysis_task = """Analysera alla olästa artiklar i systemet.
+    # Send analysis task
+    analysis_task = """Analysera alla olästa artiklar i systemet.
 
 STEG-FÖR-STEG:
-1. Hämta alla olästa artiklar med get_articles(read_status='unread', limit=1000)
-2. För varje artikel:
-   - Bedöm relevans (0.0-1.0) baserat på användarprofil
-   - Skapa koncis svensk sammanfattning (2-3 meningar)
-   - SPARA med save_article_analysis(article_id, summary, relevance_score)
-3. Identifiera artiklar från källor med deep_analysis=true
-4. För dessa artiklar:
+1. Anropa analyze_unread_batch(max_articles=100) tills remaining_unanalyzed är 0 (eller analyzed_count är 0)
+2. Analysera artiklar i failed_ids själv och spara dem samlat med save_article_analyses(items)
+3. För artiklar i deep_analysis_ids:
    - Använd trigger_deep_analysis(article_id) för att få prompt
    - Exekvera prompten och skapa djupanalys
    - Spara med save_deep_analysis(article_id, analysis_text)
 
-KRITISKT: Du MÅSTE använda save_article_analysis() för att spara varje artikels sammanfattning och relevanspoäng!
+KRITISKT: Använd analyze_unread_batch() och save_article_analyses() - spara ALDRIG en artikel i taget!
 
 När du är klar, ge en sammanfattning av vad du gjorde.
 
 BÖRJA NU!"""
 
-        await client.query(analysis_task)
+    if deep_analysis_ids:
+        analysis_task += f"""
+
+Dessa redan analyserade artiklar behöver också djupanalys (steg 3): {deep_analysis_ids}"""
 
-        # Collect response
-        response_text = []
-        async for message in client.receive_response():
-            if isinstance(message, AssistantMessage):
-                for block in message.content:
-                    if isinstance(block, TextBlock):
-                        response_text.append(block.text)
-                        console.print(f"[cyan]Agent:[/cyan] {block.text}")
+    await client.query(analysis_task)
 
-        final_response = "\n".join(response_text)
-        console.print("\n[green]✓[/green] Analysis complete!")
-        return final_response
+    # Stream response (kept for the caller's summary)
+    response_text = []
+    async for text in iter_text(client):
+        response_text.append(text)
+        console.print(f"[cyan]Agent:[/cyan] {text}")
+
+    final_response = "\n".join(response_text)
+    console.print("\n[green]✓[/green] Analysis complete!")
+    return final_response
+
+
+async def run_analysis_once(deep_analysis_ids: Optional[List[int]] = None):
+    """Run a single analysis and shut the shared client down afterwards."""
+    try:
+        return await run_analysis(deep_analysis_ids)
+    finally:
+        await close_analyzer_client()
 
 
 def main():
     """Main entry point."""
     try:
-        result = asyncio.run(run_analysis())
+        result = asyncio.run(run_analysis_once())
         console.print(f"\n[green]Analysis complete:[/green]\n{result}")
     except KeyboardInterrupt:
         console.print("\n\n[yellow]Interrupted[/yellow]")
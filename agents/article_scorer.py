@@ -0,0 +1,166 @@
+"""Direct Anthropic API scoring for the analyzer's batch tool.
+
+Scores and summarizes articles with one Messages API call each, issued
+concurrently (bounded by a semaphore), so the analyzer can process a whole
+batch inside Python instead of spending one LLM decision point (and tool
+round-trip) per article.
+
+Lives in agents/ because it calls the Anthropic API - core/ stays API-free.
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import orjson
+
+if TYPE_CHECKING:
+    from anthropic.types.messages.batch_create_params import Request
+
+DEFAULT_MODEL = 'claude-haiku-4-5-20251001'
+
+# Only the start of the article is needed for a summary and relevance score
+MAX_CONTENT_CHARS = 4000
+
+# Max in-flight Messages API requests per batch (keeps us under rate limits)
+MAX_CONCURRENT_REQUESTS = 10
+
+# Message Batches API polling - batches usually finish within minutes
+BATCH_POLL_INTERVAL_SECONDS = 10.0
+BATCH_MAX_WAIT_SECONDS = 20 * 60
+
+
+def build_scoring_prompt(article: Dict[str, Any], top_topics: List[Tuple[str, float]]) -> str:
+    """Build the Swedish scoring prompt for one article."""
+    interests = ", ".join(f"{topic} ({weight:.1f})" for topic, weight in top_topics)
+    content = article.get('content') or ''
+
+    return f"""Bedöm denna artikel för en läsare med följande intressen (vikt 0.0-1.0): {interests}
+
+ARTIKEL:
+Källa: {article.get('source_name', '')}
+Titel: {article.get('title', '')}
+Innehåll: {content[:MAX_CONTENT_CHARS]}
+
+Svara ENDAST med JSON på formatet:
+{{"summary": "<koncis svensk sammanfattning, 2-3 meningar>", "relevance_score": <0.0-1.0>}}"""
+
+
+def parse_scoring_response(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the model's JSON answer into summary + clamped relevance score."""
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+
+    try:
+        data = orjson.loads(text[start:end + 1])
+        summary = str(data['summary']).strip()
+        score = max(0.0, min(1.0, float(data['relevance_score'])))
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+    if not summary:
+        return None
+
+    return {'summary': summary, 'relevance_score': score}
+
+
+async def score_article(client: Any,
+                        semaphore: asyncio.Semaphore,
+                        article: Dict[str, Any],
+                        top_topics: List[Tuple[str, float]],
+                        model: str = DEFAULT_MODEL,
+                        max_tokens: int = 300) -> Optional[Dict[str, Any]]:
+    """
+    Summarize and score one article via the Messages API.
+
+    Returns:
+        Dict with 'summary' and 'relevance_score', or None if the answer
+        could not be parsed
+    """
+    async with semaphore:
+        response = await client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": build_scoring_prompt(article, top_topics)}]
+        )
+    text = "".join(block.text for block in response.content if block.type == "text")
+    return parse_scoring_response(text)
+
+
+async def score_articles(articles: List[Dict[str, Any]],
+                         top_topics: List[Tuple[str, float]],
+                         model: str = DEFAULT_MODEL,
+                         max_tokens: int = 300,
+                         concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Optional[Dict[str, Any]]]:
+    """
+    Score many articles concurrently.
+
+    Returns:
+        One result per input article (same order); None where the request
+        failed or the answer could not be parsed
+    """
+    from anthropic import AsyncAnthropic
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncAnthropic() as client:
+        results = await asyncio.gather(
+            *(score_article(client, semaphore, a, top_topics, model, max_tokens) for a in articles),
+            return_exceptions=True
+        )
+
+    return [r if isinstance(r, dict) else None for r in results]
+
+
+async def score_articles_batch(articles: List[Dict[str, Any]],
+                               top_topics: List[Tuple[str, float]],
+                               model: str = DEFAULT_MODEL,
+                               max_tokens: int = 300,
+                               max_wait: float = BATCH_MAX_WAIT_SECONDS) -> List[Optional[Dict[str, Any]]]:
+    """
+    Score many articles with one Message Batches API submission.
+
+    Cheaper per article than score_articles() but slower to complete - meant
+    for the background scheduler job. A batch still running after max_wait
+    seconds is cancelled.
+
+    Returns:
+        One result per input article (same order); None where the request
+        failed, expired or the answer could not be parsed
+    """
+    from anthropic import AsyncAnthropic
+
+    if not articles:
+        return []
+
+    requests: List["Request"] = [
+        {
+            "custom_id": str(article['id']),
+            "params": {
+                "model": model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": build_scoring_prompt(article, top_topics)}]
+            }
+        }
+        for article in articles
+    ]
+
+    parsed: Dict[str, Optional[Dict[str, Any]]] = {}
+    async with AsyncAnthropic() as client:
+        batch = await client.messages.batches.create(requests=requests)
+
+        deadline = time.monotonic() + max_wait
+        while batch.processing_status != "ended":
+            if time.monotonic() > deadline:
+                _ = await client.messages.batches.cancel(batch.id)
+                return [None] * len(articles)
+            await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                text = "".join(block.text for block in entry.result.message.content if block.type == "text")
+                parsed[entry.custom_id] = parse_scoring_response(text)
+
+    return [parsed.get(str(article['id'])) for article in articles]
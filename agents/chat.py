@@ -10,21 +10,20 @@ Uses Claude Agent SDK which requires:
 
 import asyncio
 import os
+import re
+from typing import TYPE_CHECKING
 
-from claude_agent_sdk import (
-    AssistantMessage,
-    ClaudeAgentOptions,
-    ClaudeSDKClient,
-    TextBlock,
-    create_sdk_mcp_server,
-    tool,
-)
-from dotenv import load_dotenv
 from rich.console import Console
 
-from agents.mcp_tools import TOOLS
-from core.database import Database
-from core.profile_manager import ProfileManager
+from agents.mcp_tools import TOOLS, profile_mgr
+from agents.sdk_tools import NVM_NODE_BIN, build_sdk_tools, iter_text
+from core.config import load_config
+
+# SDK imports are deferred (see agents/sdk_tools.py)
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
+    from core.profile_manager import ProfileManager
 
 console = Console()
 
@@ -38,57 +37,32 @@ CHAT_TOOLS = [
     'list_sources', 'add_source', 'remove_source', 'validate_feed'
 ]
 
+# Fail at import (not first run) if a tool name has no TOOLS entry
+_unknown_tools = set(CHAT_TOOLS) - TOOLS.keys()
+if _unknown_tools:
+    raise ValueError(f"Unknown tools in CHAT_TOOLS: {sorted(_unknown_tools)}")
+
+ALLOWED_TOOLS = tuple(f"mcp__news_tools__{tool_name}" for tool_name in CHAT_TOOLS)
+
+# Greetings and thanks are answered directly by Haiku, skipping the CLI subprocess.
+# Only these exact phrases - anything else (e.g. "ja" to a question) may be an
+# answer the agent session has to see
+SIMPLE_TURN_MODEL = 'claude-haiku-4-5-20251001'
+SIMPLE_TURN_PHRASES = frozenset({
+    'hej', 'hej hej', 'hejsan', 'hallå', 'tja', 'tjena', 'god morgon', 'god kväll',
+    'tack', 'tack så mycket', 'tusen tack', 'tackar', 'hi', 'hello', 'thanks', 'thank you',
+})
+# Word prefixes that signal the turn needs tools (articles, sources, profile...)
+TOOL_INTENT_PATTERN = re.compile(
+    r'\b(artik|nyhet|nytt|hämta|visa|läs|sök|källa|källor|feedback|profil|intress|markera|statisti|djupanalys)'
+)
+SIMPLE_TURN_SYSTEM_PROMPT = """Du är en vänlig nyhetsassistent. Svara kort och konversationellt på svenska.
+Du har inga verktyg i detta svar - om användaren vill se artiklar, källor eller sin profil,
+be dem fråga om det så hämtar du datan."""
 
-def create_mcp_server():
-    """Create MCP server with chat tools."""
-    sdk_tools = []
-
-    for tool_name in CHAT_TOOLS:
-        tool_info = TOOLS[tool_name]
-
-        def make_tool_wrapper(name, func, desc, params):
-            input_schema = params if params else {}
-
-            @tool(name, desc, input_schema)
-            async def wrapper(args):
-                console.print(f"[dim]🔧 {name}[/dim]")
-                result = func(args)
-                import json
-                result_json = json.dumps(result, ensure_ascii=False, indent=2)
-                return {
-                    "content": [
-                        {"type": "text", "text": result_json}
-                    ]
-                }
-            return wrapper
-
-        sdk_tools.append(make_tool_wrapper(
-            tool_name,
-            tool_info['function'],
-            tool_info['description'],
-            tool_info['parameters']
-        ))
-
-    return create_sdk_mcp_server(
-        name="news_tools",
-        version="1.0.0",
-        tools=sdk_tools
-    )
-
-
-def get_system_prompt(profile: ProfileManager) -> str:
-    """Get system prompt for chat agent."""
-    profile_data = profile.get_profile()
-    top_topics = profile.get_top_topics(5)
-    topics_str = ", ".join([f"{topic} ({weight:.1f})" for topic, weight in top_topics])
-
-    return f"""Du är en intelligent nyhetsassistent med full tillgång till användarens nyhetssystem via verktyg.
-
-ANVÄNDARENS PROFIL:
-- Huvudintressen: {topics_str}
-- Antal ämnen i profil: {len(profile_data)}
-
-TILLGÄNGLIGA VERKTYG:
+# Tool/workflow instructions - kept out of the system prompt and injected into
+# the conversation only when a turn needs tools (see with_tool_docs)
+TOOL_DOCS = f"""TILLGÄNGLIGA VERKTYG:
 Du har tillgång till {len(CHAT_TOOLS)} interaktiva verktyg för att hantera nyheter.
 
 **VIKTIGT OM BAKGRUNDSHÄMTNING:**
@@ -191,44 +165,86 @@ Användare: "Visa artiklar från SVT Inrikes"
 
 VIKTIGT: Gissa ALDRIG på källnamn - lista alltid källor först när du är osäker!"""
 
+def create_mcp_server():
+    """Create MCP server with chat tools."""
+    from claude_agent_sdk import create_sdk_mcp_server
+
+    return create_sdk_mcp_server(
+        name="news_tools",
+        version="1.0.0",
+        tools=build_sdk_tools(CHAT_TOOLS)
+    )
+
+
+def get_system_prompt(profile: "ProfileManager") -> str:
+    """Get the (minimal) system prompt for chat agent - tool docs are sent via with_tool_docs()."""
+    top_topics = profile.get_top_topics(5)
+    topics_str = ", ".join([f"{topic} ({weight:.1f})" for topic, weight in top_topics])
+
+    return f"""Du är en intelligent nyhetsassistent med full tillgång till användarens nyhetssystem via verktyg.
+Användarens huvudintressen: {topics_str}
+Använd verktyg för att hämta faktisk data, gissa aldrig. Var konversationell och hjälpsam på svenska."""
+
+
+def needs_tool_docs(user_input: str) -> bool:
+    """Check if a chat turn looks like it needs the tool workflow docs."""
+    return bool(TOOL_INTENT_PATTERN.search(user_input.lower()))
+
+
+def with_tool_docs(user_input: str) -> str:
+    """Prepend the tool workflow docs to a user turn."""
+    return f"{TOOL_DOCS}\n\nANVÄNDARENS MEDDELANDE:\n{user_input}"
+
+
+def is_simple_turn(user_input: str, last_reply: str = "") -> bool:
+    """Check if a chat turn is a plain greeting or thanks that needs no tools.
+
+    Never true right after a reply whose last line asks something - the turn
+    is then probably the answer.
+    """
+    if '?' in last_reply.rstrip().rpartition('\n')[2]:
+        return False
+    return user_input.lower().strip(' !.') in SIMPLE_TURN_PHRASES
+
+
+async def answer_simple_turn(api_client: "AsyncAnthropic", user_input: str) -> str:
+    """Answer a simple chat turn with one direct Messages API call."""
+    response = await api_client.messages.create(
+        model=SIMPLE_TURN_MODEL,
+        max_tokens=300,
+        system=SIMPLE_TURN_SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": user_input}]
+    )
+    return "".join(block.text for block in response.content if block.type == "text")
+
 
 def create_chat_client():
     """Create and configure a chat agent client (reusable across interfaces)."""
+    from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
+    from dotenv import load_dotenv
     _ = load_dotenv()
 
-    db = Database()
-    profile = ProfileManager(db=db)
-
     # Check API key
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
     # Load model from config
-    import json
-    try:
-        with open('config.json', 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        model = config.get('claude_model', 'claude-haiku-4-5-20251001')
-    except (FileNotFoundError, json.JSONDecodeError):
-        model = 'claude-haiku-4-5-20251001'  # Default fallback
+    model = load_config().get('claude_model', 'claude-haiku-4-5-20251001')
 
     # Create MCP server
     mcp_server = create_mcp_server()
 
-    # Setup options
-    allowed_tools = [f"mcp__news_tools__{tool_name}" for tool_name in CHAT_TOOLS]
-
     # NVM-specific configuration
     subprocess_env = os.environ.copy()
-    subprocess_env["PATH"] = f"/Users/mikaelsjovind/.nvm/versions/node/v22.15.1/bin:{subprocess_env.get('PATH', '')}"
+    subprocess_env["PATH"] = f"{NVM_NODE_BIN}:{subprocess_env.get('PATH', '')}"
 
     options = ClaudeAgentOptions(
         mcp_servers={"news_tools": mcp_server},
-        allowed_tools=allowed_tools,
-        system_prompt=get_system_prompt(profile),
+        allowed_tools=list(ALLOWED_TOOLS),
+        system_prompt=get_system_prompt(profile_mgr),
         permission_mode='bypassPermissions',
-        cli_path="/Users/mikaelsjovind/.nvm/versions/node/v22.15.1/bin/claude",
+        cli_path=f"{NVM_NODE_BIN}/claude",
         env=subprocess_env,
         model=model
     )
@@ -260,8 +276,10 @@ async def run_chat():
     console.print(f"[green]✓[/green] Loaded {len(CHAT_TOOLS)} tools")
     console.print("[dim]Använder Agent SDK med Claude Code CLI[/dim]\n")
 
+    from anthropic import AsyncAnthropic
+
     # Create client and run conversation
-    async with client:
+    async with client, AsyncAnthropic() as api_client:
         # Startup routine
         startup_prompt = """Kör följande startup-rutin:
 
@@ -317,18 +335,16 @@ ABSOLUT KRITISKT:
 - MARKERA INTE artiklarna som lästa automatiskt - fråga användaren först!
 - Om du inte visar ALLA artiklar bryter du användarens förtroende!"""
 
-        await client.query(startup_prompt)
-
-        # Collect greeting
-        response_text = []
-        async for message in client.receive_response():
-            if isinstance(message, AssistantMessage):
-                for block in message.content:
-                    if isinstance(block, TextBlock):
-                        response_text.append(block.text)
+        # Startup always uses tools - its docs then stay in the session history
+        await client.query(with_tool_docs(startup_prompt))
 
-        greeting = "\n".join(response_text)
-        console.print(f"[cyan]Agent:[/cyan] {greeting}\n")
+        # Stream greeting (the last block is kept for is_simple_turn)
+        console.print("[cyan]Agent:[/cyan]", end=" ")
+        last_reply = ""
+        async for text in iter_text(client):
+            console.print(text)
+            last_reply = text
+        console.print()
 
         # Conversation loop
         while True:
@@ -343,18 +359,21 @@ ABSOLUT KRITISKT:
                     console.print("\n[yellow]Avslutar agent-läsaren...[/yellow]")
                     break
 
+                # Greetings and thanks don't need tools - skip the agent round-trip
+                if is_simple_turn(user_input, last_reply):
+                    last_reply = await answer_simple_turn(api_client, user_input)
+                    console.print(f"\n[cyan]Agent:[/cyan] {last_reply}\n")
+                    continue
+
                 # Get agent response
                 await client.query(user_input)
 
-                response_text = []
-                async for message in client.receive_response():
-                    if isinstance(message, AssistantMessage):
-                        for block in message.content:
-                            if isinstance(block, TextBlock):
-                                response_text.append(block.text)
-
-                response = "\n".join(response_text)
-                console.print(f"\n[cyan]Agent:[/cyan] {response}\n")
+                # Print blocks as they arrive - only the last one is kept
+                console.print("\n[cyan]Agent:[/cyan]", end=" ")
+                async for text in iter_text(client):
+                    console.print(text)
+                    last_reply = text
+                console.print()
 
             except KeyboardInterrupt:
                 console.print("\n\n[yellow]Avbruten[/yellow]")
@@ -369,7 +388,7 @@ ABSOLUT KRITISKT:
                 continue
 
     # Summary
-    stats = TOOLS['get_stats']['function']({})
+    stats = TOOLS['get_stats'].function({})
     console.print("\n[bold]Session Summary:[/bold]")
     if 'total_articles' in stats:
         console.print(f"  Total artiklar: {stats['total_articles']}")
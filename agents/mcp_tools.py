@@ -1,7 +1,16 @@
 """MCP tools for Agent SDK - provides agent with full system access."""
 
+import functools
+import os
+import re
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Tuple
 
 from core.article_manager import ArticleManager
 from core.database import Database
@@ -13,11 +22,132 @@ from core.source_manager import SourceManager
 # Initialize shared instances
 db = Database()
 source_mgr = SourceManager()
-feed_fetcher = FeedFetcher(db=db)
-article_mgr = ArticleManager(db=db)
+feed_fetcher = FeedFetcher(db=db, source_mgr=source_mgr)
+article_mgr = ArticleManager(db=db, source_mgr=source_mgr)
 profile_mgr = ProfileManager(db=db)
 feedback_mgr = FeedbackManager(db=db)
 
+# Short-lived LRU cache for read tools the agent calls on almost every turn
+# (list_sources, get_source_prefs, get_stats and article queries). Cleared by
+# tools that change what they report. Tools run in worker threads, hence the lock.
+CACHE_TTL_SECONDS = 30.0
+CACHE_MAX_ENTRIES = 256
+_tool_cache: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_tool_cache_lock = threading.Lock()
+
+# Formatting tracebacks walks the stack; only worth it when debugging
+DEBUG = os.getenv("NEWS_DEBUG") == "1"
+
+
+def _cached(key: Hashable, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return a cached tool result younger than CACHE_TTL_SECONDS, else recompute it."""
+    now = time.monotonic()
+    with _tool_cache_lock:
+        hit = _tool_cache.get(key)
+        if hit and now - hit[0] < CACHE_TTL_SECONDS:
+            _tool_cache.move_to_end(key)
+            return hit[1]
+
+    value = compute()
+    with _tool_cache_lock:
+        _tool_cache[key] = (now, value)
+        _tool_cache.move_to_end(key)
+        while len(_tool_cache) > CACHE_MAX_ENTRIES:
+            _ = _tool_cache.popitem(last=False)
+    return value
+
+
+def _invalidate_cache() -> None:
+    """Drop all cached tool results (call after writes)."""
+    with _tool_cache_lock:
+        _tool_cache.clear()
+
+
+def _error_result(e: Exception) -> Dict[str, Any]:
+    """Error response for a failed tool; includes the traceback only when NEWS_DEBUG=1."""
+    result: Dict[str, Any] = {"success": False, "error": str(e)}
+    if DEBUG:
+        result["traceback"] = traceback.format_exc()
+    return result
+
+
+# Typed arguments for tools that take an article id. with_args() builds them
+# from the raw args dict once (int/float fields are coerced), so the tools
+# don't each repeat the int(args[...]) lookups and their error handling.
+@dataclass(slots=True)
+class ArticleIdArgs:
+    article_id: int
+
+
+@dataclass(slots=True)
+class ArticleDetailsArgs:
+    article_id: int
+    include_deep_analysis: bool = True
+
+
+@dataclass(slots=True)
+class DeepAnalysisArgs:
+    article_id: int
+    analysis_text: str = ''
+
+
+@dataclass(slots=True)
+class ArticleAnalysisArgs:
+    article_id: int
+    relevance_score: float
+    summary: str = ''
+
+
+def with_args(schema: type) -> Callable[[Callable[[Any], Dict[str, Any]]], Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Decorator: parse the tool's args dict into a schema dataclass before calling it."""
+    schema_fields = tuple((field.name, field.type) for field in fields(schema))
+
+    def decorator(func: Callable[[Any], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        @functools.wraps(func)
+        def wrapper(args: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                typed = schema(**{
+                    name: kind(args[name]) if kind in (int, float) else args[name]
+                    for name, kind in schema_fields if name in args
+                })
+            except (TypeError, ValueError) as e:
+                return {"success": False, "error": f"Invalid arguments: {e}"}
+            return func(typed)
+        return wrapper
+    return decorator
+
+
+def _query_articles(**filters: Any) -> Dict[str, Any]:
+    """Cached article_mgr.query_articles_advanced() for scalar filters."""
+    # Key prefix is versioned so a change in result shape can retire old entries
+    key = ('v1', 'query_articles', tuple(sorted(filters.items())))
+    return _cached(key, lambda: article_mgr.query_articles_advanced(**filters))
+
+
+# Predefined source suggestions, keyed by a substring of the interest topic
+SOURCE_SUGGESTIONS: Dict[str, List[Dict[str, str]]] = {
+    'ai': [
+        {"name": "The Gradient", "url": "https://thegradient.pub/rss/"},
+        {"name": "AI News", "url": "https://artificialintelligence-news.com/feed/"}
+    ],
+    'apple': [
+        {"name": "9to5Mac", "url": "https://9to5mac.com/feed/"},
+        {"name": "AppleInsider", "url": "https://appleinsider.com/rss/news/"}
+    ],
+    'tesla': [
+        {"name": "Electrek Tesla", "url": "https://electrek.co/guides/tesla/feed/"}
+    ],
+    'politik': [
+        {"name": "Altinget", "url": "https://www.altinget.se/rss/"}
+    ]
+}
+
+# One alternation over all keys: a topic string is scanned once per call
+# instead of once per key (longest first, so a key wins over its prefixes)
+_SUGGESTION_PATTERN = re.compile(
+    '|'.join(re.escape(key) for key in sorted(SOURCE_SUGGESTIONS, key=len, reverse=True))
+)
+
 
 # ============================================================================
 # FEEDBACK & ANALYSIS TOOLS
@@ -34,7 +164,8 @@ def save_feedback_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 
     # Save feedback
     feedback_id = feedback_mgr.add_feedback(article_id, rating, note)
-    article_mgr.mark_as_read(article_id)
+    _ = article_mgr.mark_as_read(article_id)
+    _invalidate_cache()
 
     # Learn from feedback
     updates = profile_mgr.learn_from_feedback(article_id, rating)
@@ -116,28 +247,28 @@ def fetch_articles_from_feed_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     The analyze parameter is deprecated since analyzer no longer makes direct API calls.
     """
     result = feed_fetcher.fetch_all()
+    _invalidate_cache()
 
     # Return info about unanalyzed articles
-    unanalyzed = article_mgr.get_unanalyzed_articles()
-    result['unanalyzed_count'] = len(unanalyzed)
+    result['unanalyzed_count'] = article_mgr.count_unanalyzed_articles()
 
     return result
 
 
-def mark_article_read_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+@with_args(ArticleIdArgs)
+def mark_article_read_tool(args: ArticleIdArgs) -> Dict[str, Any]:
     """Mark an article as read."""
-    article_id = int(args['article_id'])
+    article_id = args.article_id
 
-    article = article_mgr.get_article(article_id)
-    if not article:
+    title = article_mgr.mark_as_read(article_id)
+    if title is None:
         return {"success": False, "error": "Article not found"}
-
-    article_mgr.mark_as_read(article_id)
+    _invalidate_cache()
 
     return {
         "success": True,
         "article_id": article_id,
-        "title": article['title']
+        "title": title
     }
 
 
@@ -148,10 +279,8 @@ def mark_articles_read_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     if not article_ids:
         return {"success": False, "error": "article_ids is required"}
 
-    marked_count = 0
-    for article_id in article_ids:
-        article_mgr.mark_as_read(int(article_id))
-        marked_count += 1
+    marked_count = article_mgr.mark_many_as_read([int(article_id) for article_id in article_ids])
+    _invalidate_cache()
 
     return {
         "success": True,
@@ -160,6 +289,13 @@ def mark_articles_read_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Presentation detail per relevance tier (see get_articles grouped=True)
+TIER_PRESENTATION_HINTS = {"high": "full", "medium": "compact", "low": "minimal"}
+
+# Hours covered by get_articles time_filter values
+TIME_FILTER_HOURS = {'last_24h': 24, 'last_week': 168, 'last_month': 720}
+
+
 def get_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """
     Get articles with flexible filtering. NEVER marks as read automatically.
@@ -175,17 +311,19 @@ def get_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
         published_since = args.get('published_since')
         limit = args.get('limit')  # Agent MUST specify limit explicitly
         offset = args.get('offset', 0)
+        after = args.get('after')
         sort_by = args.get('sort_by', 'relevance_desc')
         grouped = args.get('grouped', False)
 
         # Convert time_filter to timestamp
         if time_filter:
-            hours_map = {'last_24h': 24, 'last_week': 168, 'last_month': 720}
-            hours = hours_map.get(time_filter, 24)
-            fetched_since = (datetime.now() - timedelta(hours=hours)).isoformat()
+            hours = TIME_FILTER_HOURS.get(time_filter, 24)
+            # Whole minutes, so repeated calls share a cache key
+            since = datetime.now().replace(second=0, microsecond=0) - timedelta(hours=hours)
+            fetched_since = since.isoformat()
 
-        # Query database
-        result = article_mgr.query_articles_advanced(
+        # Query database (cached briefly - repeated identical calls are common)
+        result = _query_articles(
             read_status=read_status,
             source=source,
             min_relevance=min_relevance,
@@ -193,6 +331,7 @@ def get_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
             published_after=published_since,
             limit=limit,
             offset=offset,
+            after=tuple(after) if after else None,
             sort_by=sort_by
         )
 
@@ -201,49 +340,36 @@ def get_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 
         # Group by tiers if requested
         if grouped:
-            high_relevance = []
-            medium_relevance = []
-            low_relevance = []
+            tiers = {"high": [], "medium": [], "low": []}
 
+            # Single pass; annotated copies, since the query rows are shared
+            # with the tool cache (and its ungrouped callers)
             for article in articles:
-                score = article.get('relevance_score', 0)
-                article_with_hint = dict(article)
+                score = article.get('relevance_score') or 0
 
-                # Deep analysis boost
-                has_deep = bool(article.get('deep_analysis'))
+                # Deep analysis boost (flag comes from the query, no extra lookup)
+                has_deep = bool(article.get('has_deep_analysis') or article.get('deep_analysis'))
                 if has_deep:
                     score = max(score, 0.75)
-                    article_with_hint['has_deep_analysis'] = True
-                else:
-                    article_with_hint['has_deep_analysis'] = False
-
-                if score >= 0.7:
-                    article_with_hint['presentation_hint'] = 'full'
-                    article_with_hint['tier'] = 'high'
-                    high_relevance.append(article_with_hint)
-                elif score >= 0.4:
-                    article_with_hint['presentation_hint'] = 'compact'
-                    article_with_hint['tier'] = 'medium'
-                    medium_relevance.append(article_with_hint)
-                else:
-                    article_with_hint['presentation_hint'] = 'minimal'
-                    article_with_hint['tier'] = 'low'
-                    low_relevance.append(article_with_hint)
-
-            # Consistent return format: always include 'articles' key
+
+                tier = 'high' if score >= 0.7 else 'medium' if score >= 0.4 else 'low'
+                tiers[tier].append({
+                    **article,
+                    'has_deep_analysis': has_deep,
+                    'presentation_hint': TIER_PRESENTATION_HINTS[tier],
+                    'tier': tier
+                })
+
+            # Rows are only sent once, in their tier; article_ids keeps the sort order
             return {
                 "success": True,
-                "articles": articles,  # Full list for compatibility
+                "article_ids": [article['id'] for article in articles],
                 "articles_by_tier": {
-                    "high_relevance": high_relevance,
-                    "medium_relevance": medium_relevance,
-                    "low_relevance": low_relevance
-                },
-                "tier_counts": {
-                    "high": len(high_relevance),
-                    "medium": len(medium_relevance),
-                    "low": len(low_relevance)
+                    "high_relevance": tiers['high'],
+                    "medium_relevance": tiers['medium'],
+                    "low_relevance": tiers['low']
                 },
+                "tier_counts": {tier: len(rows) for tier, rows in tiers.items()},
                 "total": len(articles),
                 "grouped": True
             }
@@ -257,15 +383,7 @@ def get_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        # Return error info for debugging
-        import traceback
-        return {
-            "success": False,
-            "error": str(e),
-            "traceback": traceback.format_exc(),
-            "articles": [],
-            "total": 0
-        }
+        return {**_error_result(e), "articles": [], "total": 0}
 
 
 def search_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
@@ -282,7 +400,7 @@ def search_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     min_relevance = args.get('min_relevance')
     limit = args.get('limit')  # Agent MUST specify limit explicitly
 
-    result = article_mgr.query_articles_advanced(
+    result = _query_articles(
         search_query=query,
         search_in=search_in,
         min_relevance=min_relevance,
@@ -293,21 +411,23 @@ def search_articles_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-def get_article_details_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+@with_args(ArticleDetailsArgs)
+def get_article_details_tool(args: ArticleDetailsArgs) -> Dict[str, Any]:
     """Get full details of a specific article including deep analysis if available."""
-    article_id = int(args['article_id'])
-    include_deep = args.get('include_deep_analysis', True)
+    article_id = args.article_id
+    include_deep = args.include_deep_analysis
 
-    article = article_mgr.get_article(article_id)
+    # Article and its feedback in one query
+    article = article_mgr.get_article_with_feedback(article_id)
     if not article:
         return {"success": False, "error": "Article not found"}
 
-    feedback = feedback_mgr.get_article_feedback(article_id)
+    feedback = article.pop('feedback')
 
     result = {
         "success": True,
-        "article": dict(article),
-        "feedback": [dict(f) for f in feedback]
+        "article": article,
+        "feedback": feedback
     }
 
     # Include deep_analysis if present (as markdown text)
@@ -317,7 +437,8 @@ def get_article_details_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-def trigger_deep_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+@with_args(ArticleIdArgs)
+def trigger_deep_analysis_tool(args: ArticleIdArgs) -> Dict[str, Any]:
     """
     Get deep analysis prompt for a specific article.
 
@@ -326,7 +447,7 @@ def trigger_deep_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 
     Returns the article info and prompt for the agent to execute.
     """
-    article_id = int(args['article_id'])
+    article_id = args.article_id
 
     article = article_mgr.get_article(article_id)
     if not article:
@@ -362,15 +483,16 @@ def trigger_deep_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
-def save_deep_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+@with_args(DeepAnalysisArgs)
+def save_deep_analysis_tool(args: DeepAnalysisArgs) -> Dict[str, Any]:
     """
     Save deep analysis result for an article.
 
     Use after executing the prompt from trigger_deep_analysis().
     """
     try:
-        article_id = int(args['article_id'])
-        analysis_text = args.get('analysis_text', '').strip()
+        article_id = args.article_id
+        analysis_text = args.analysis_text.strip()
 
         if not analysis_text:
             return {
@@ -378,50 +500,38 @@ def save_deep_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
                 "error": "analysis_text is required and cannot be empty"
             }
 
-        # Verify article exists
-        article = article_mgr.get_article(article_id)
-        if not article:
+        # Save the analysis (returns None if the article doesn't exist)
+        title = article_mgr.save_deep_analysis(article_id, analysis_text)
+        if title is None:
             return {
                 "success": False,
                 "error": f"Article {article_id} not found"
             }
-
-        # Save the analysis
-        saved = article_mgr.save_deep_analysis(article_id, analysis_text)
-
-        if not saved:
-            return {
-                "success": False,
-                "error": f"Failed to save analysis for article {article_id}"
-            }
+        _invalidate_cache()
 
         return {
             "success": True,
             "article_id": article_id,
-            "title": article.get('title', ''),
+            "title": title,
             "message": f"Deep analysis saved for article {article_id}",
             "analysis_length": len(analysis_text)
         }
 
     except Exception as e:
-        import traceback
-        return {
-            "success": False,
-            "error": str(e),
-            "traceback": traceback.format_exc()
-        }
+        return _error_result(e)
 
 
-def save_article_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+@with_args(ArticleAnalysisArgs)
+def save_article_analysis_tool(args: ArticleAnalysisArgs) -> Dict[str, Any]:
     """
     Save analysis results (summary and relevance score) for an article.
 
     This is the primary tool for saving article analysis performed by the analyzer agent.
     """
     try:
-        article_id = int(args['article_id'])
-        summary = args.get('summary', '').strip()
-        relevance_score = float(args['relevance_score'])
+        article_id = args.article_id
+        summary = args.summary.strip()
+        relevance_score = args.relevance_score
 
         if not summary:
             return {
@@ -435,39 +545,139 @@ def save_article_analysis_tool(args: Dict[str, Any]) -> Dict[str, Any]:
                 "error": "relevance_score must be between 0.0 and 1.0"
             }
 
-        # Verify article exists
-        article = article_mgr.get_article(article_id)
-        if not article:
+        # Save the analysis (returns None if the article doesn't exist)
+        title = article_mgr.save_analysis(article_id, summary, relevance_score)
+        if title is None:
             return {
                 "success": False,
                 "error": f"Article {article_id} not found"
             }
-
-        # Save the analysis
-        saved = article_mgr.save_analysis(article_id, summary, relevance_score)
-
-        if not saved:
-            return {
-                "success": False,
-                "error": f"Failed to save analysis for article {article_id}"
-            }
+        _invalidate_cache()
 
         return {
             "success": True,
             "article_id": article_id,
-            "title": article.get('title', ''),
+            "title": title,
             "relevance_score": relevance_score,
             "message": f"Analysis saved for article {article_id}"
         }
 
     except Exception as e:
-        import traceback
+        return _error_result(e)
+
+
+def save_article_analyses_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Save analysis results for many articles in one call (bulk write).
+
+    Validates every item, then writes all valid ones in a single transaction.
+    """
+    try:
+        items = args.get('items', [])
+        if not items:
+            return {"success": False, "error": "items is required and cannot be empty"}
+
+        rows = []
+        invalid = []
+        for item in items:
+            try:
+                article_id = int(item['article_id'])
+                summary = str(item.get('summary', '')).strip()
+                relevance_score = float(item['relevance_score'])
+            except (KeyError, TypeError, ValueError):
+                invalid.append({"item": item, "error": "article_id and relevance_score are required"})
+                continue
+
+            if not summary:
+                invalid.append({"article_id": article_id, "error": "summary cannot be empty"})
+            elif not 0.0 <= relevance_score <= 1.0:
+                invalid.append({"article_id": article_id, "error": "relevance_score must be between 0.0 and 1.0"})
+            else:
+                rows.append((article_id, summary, relevance_score))
+
+        saved_count = article_mgr.save_analyses(rows)
+        _invalidate_cache()
+
         return {
-            "success": False,
-            "error": str(e),
-            "traceback": traceback.format_exc()
+            "success": not invalid,
+            "saved_count": saved_count,
+            "not_found_count": len(rows) - saved_count,
+            "invalid": invalid,
+            "message": f"Saved analysis for {saved_count} of {len(items)} articles"
+        }
+
+    except Exception as e:
+        return _error_result(e)
+
+
+async def analyze_unread_batch_tool(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize, score and save a whole batch of unanalyzed articles in one call.
+
+    Runs the per-article Messages API calls concurrently in Python instead of
+    letting the agent issue one save_article_analysis call per article.
+    Returns counts plus the IDs of articles whose source wants deep analysis.
+    """
+    try:
+        from agents.article_scorer import DEFAULT_MODEL, score_articles, score_articles_batch
+
+        max_articles = int(args.get('max_articles', 100))
+        model = article_mgr.config.get('claude_model', DEFAULT_MODEL)
+        max_tokens = int(article_mgr.config.get('max_tokens_per_summary', 300))
+
+        articles = article_mgr.get_unanalyzed_articles(
+            limit=max_articles,
+            fields=('id', 'title', 'content', 'source_name', 'deep_analysis')
+        )
+        top_topics = profile_mgr.get_top_topics(10)
+        deep_sources = {s['name'] for s in source_mgr.list_sources() if s.get('deep_analysis')}
+
+        counts = {"high": 0, "medium": 0, "low": 0}
+        failed_ids = []
+        deep_analysis_ids = []
+        rows = []
+
+        # Message Batches API: cheaper for the background job, but completes in minutes
+        if article_mgr.config.get('use_message_batches', False):
+            analyses = await score_articles_batch(articles, top_topics, model=model, max_tokens=max_tokens)
+        else:
+            analyses = await score_articles(articles, top_topics, model=model, max_tokens=max_tokens)
+
+        for article, analysis in zip(articles, analyses):
+            if not analysis:
+                failed_ids.append(article['id'])
+                continue
+
+            score = analysis['relevance_score']
+            rows.append((article['id'], analysis['summary'], score))
+
+            if score >= 0.7:
+                counts["high"] += 1
+            elif score >= 0.4:
+                counts["medium"] += 1
+            else:
+                counts["low"] += 1
+
+            if article['source_name'] in deep_sources and not article.get('deep_analysis'):
+                deep_analysis_ids.append(article['id'])
+
+        # One transaction for the whole batch
+        analyzed = article_mgr.save_analyses(rows)
+        _invalidate_cache()
+
+        return {
+            "success": True,
+            "analyzed_count": analyzed,
+            "relevance_counts": counts,
+            "failed_ids": failed_ids,
+            "deep_analysis_ids": deep_analysis_ids,
+            "remaining_unanalyzed": article_mgr.count_unanalyzed_articles(),
+            "message": f"Analyzed {analyzed} of {len(articles)} articles"
         }
 
+    except Exception as e:
+        return _error_result(e)
+
 
 def mark_all_read_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -477,6 +687,7 @@ def mark_all_read_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     Use when user has read articles externally or wants to clear all unread.
     """
     count = article_mgr.mark_all_as_read()
+    _invalidate_cache()
 
     return {
         "success": True,
@@ -493,14 +704,15 @@ def update_reader_profile_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """Update reader profile with topic weights."""
     updates = args['updates']  # Dict of {topic: weight}
 
-    results = []
-    for topic, weight in updates.items():
-        success = profile_mgr.update_topic(topic, float(weight), "agent_updated")
-        results.append({
-            'topic': topic,
-            'weight': weight,
-            'success': success
-        })
+    # One transaction for all topics
+    _ = profile_mgr.update_topics_bulk(
+        [(topic, float(weight), "agent_updated") for topic, weight in updates.items()]
+    )
+    _invalidate_cache()
+    results = [
+        {'topic': topic, 'weight': weight, 'success': True}
+        for topic, weight in updates.items()
+    ]
 
     return {
         "success": True,
@@ -518,16 +730,19 @@ def get_reader_profile_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Profile weight for add_interest priorities
+PRIORITY_WEIGHTS = {'high': 0.8, 'medium': 0.6, 'low': 0.4}
+
+
 def add_interest_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """Add a new interest/topic to profile."""
     topic = args['topic']
     priority = args.get('priority', 'medium')
 
-    # Map priority to weight
-    weight_map = {'high': 0.8, 'medium': 0.6, 'low': 0.4}
-    weight = weight_map.get(priority, 0.6)
+    weight = PRIORITY_WEIGHTS.get(priority, 0.6)
 
     success = profile_mgr.update_topic(topic, weight, "explicit")
+    _invalidate_cache()
 
     return {
         "success": success,
@@ -542,6 +757,7 @@ def remove_interest_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     topic = args['topic']
 
     deleted = profile_mgr.remove_topic(topic)
+    _invalidate_cache()
 
     return {
         "success": deleted,
@@ -558,6 +774,7 @@ def adjust_relevance_threshold_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 
     old_threshold = feedback_mgr.get_relevance_threshold()
     success = feedback_mgr.set_relevance_threshold(new_threshold)
+    _invalidate_cache()
 
     return {
         "success": success,
@@ -573,30 +790,20 @@ def adjust_relevance_threshold_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 def get_reading_stats_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """Get comprehensive reading statistics."""
     try:
-        stats = feedback_mgr.get_stats()
-        learning_stats = feedback_mgr.get_learning_stats()
-
-        return {
+        return _cached('get_stats', lambda: {
             "success": True,
-            **stats,
-            "learning": learning_stats
-        }
+            **feedback_mgr.get_stats(),
+            "learning": feedback_mgr.get_learning_stats()
+        })
     except Exception as e:
-        import traceback
-        return {
-            "success": False,
-            "error": str(e),
-            "traceback": traceback.format_exc()
-        }
+        return _error_result(e)
 
 
 def get_source_preferences_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """Get preferences by RSS source."""
-    preferences = feedback_mgr.get_source_preferences()
-
-    return {
-        "source_preferences": preferences
-    }
+    return _cached('get_source_prefs', lambda: {
+        "source_preferences": feedback_mgr.get_source_preferences()
+    })
 
 
 def identify_trending_topics_tool(args: Dict[str, Any]) -> Dict[str, Any]:
@@ -604,19 +811,8 @@ def identify_trending_topics_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     days = args.get('days', 7)
     since_date = (datetime.now() - timedelta(days=days)).isoformat()
 
-    articles = article_mgr.get_articles(since_date=since_date, limit=None)
-
-    # Extract topics from recent articles
-    topic_count = {}
-    for article in articles:
-        topics = profile_mgr.extract_topics_from_text(
-            article.get('content', ''),
-            article.get('title', '')
-        )
-        for topic in topics:
-            topic_count[topic] = topic_count.get(topic, 0) + 1
-
-    trending = sorted(topic_count.items(), key=lambda x: x[1], reverse=True)[:10]
+    # One aggregation over topics matched at ingest
+    trending = profile_mgr.get_trending_topics(since_date, limit=10)
 
     return {
         "trending_topics": [
@@ -631,38 +827,14 @@ def suggest_new_sources_tool(args: Dict[str, Any]) -> Dict[str, Any]:
     """Suggest new RSS sources based on interests."""
     top_topics = profile_mgr.get_top_topics(5)
 
-    # Predefined suggestions based on topics
-    suggestions_map = {
-        'ai': [
-            {"name": "The Gradient", "url": "https://thegradient.pub/rss/"},
-            {"name": "AI News", "url": "https://artificialintelligence-news.com/feed/"}
-        ],
-        'apple': [
-            {"name": "9to5Mac", "url": "https://9to5mac.com/feed/"},
-            {"name": "AppleInsider", "url": "https://appleinsider.com/rss/news/"}
-        ],
-        'tesla': [
-            {"name": "Electrek Tesla", "url": "https://electrek.co/guides/tesla/feed/"}
-        ],
-        'politik': [
-            {"name": "Altinget", "url": "https://www.altinget.se/rss/"}
-        ]
-    }
-
-    suggestions = []
+    # Each suggested feed once (keyed by URL), in match order
+    suggestions: Dict[str, Dict[str, str]] = {}
     for topic, weight in top_topics[:3]:
-        topic_lower = topic.lower()
-        for key, sources in suggestions_map.items():
-            if key in topic_lower:
-                suggestions.extend(sources)
-
-    # Remove duplicates
-    seen = set()
-    unique_suggestions = []
-    for s in suggestions:
-        if s['url'] not in seen:
-            seen.add(s['url'])
-            unique_suggestions.append(s)
+        for match in _SUGGESTION_PATTERN.finditer(topic.lower()):
+            for source in SOURCE_SUGGESTIONS[match.group()]:
+                _ = suggestions.setdefault(source['url'], source)
+
+    unique_suggestions = list(suggestions.values())
 
     return {
         "suggestions": unique_suggestions[:5],
@@ -680,23 +852,16 @@ def list_sources_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 
     Simple listing of all RSS feeds in the system.
     """
-    sources = source_mgr.list_sources()
-    include_stats = args.get('include_stats', False)
+    include_stats = bool(args.get('include_stats', False))
+    return _cached(('list_sources', include_stats), lambda: _list_sources(include_stats))
+
 
+def _list_sources(include_stats: bool) -> Dict[str, Any]:
+    """Build the list_sources result (uncached)."""
     if include_stats:
-        # Enhance with article counts per source
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            _ = cursor.execute("""
-                SELECT source_name, COUNT(*) as count
-                FROM articles
-                GROUP BY source_name
-            """)
-            stats_map = {row['source_name']: row['count'] for row in cursor.fetchall()}
-
-        # Add stats to sources
-        for source in sources:
-            source['article_count'] = stats_map.get(source['name'], 0)
+        sources = source_mgr.list_sources_with_counts(article_mgr.count_by_source())
+    else:
+        sources = source_mgr.list_sources()
 
     return {
         "success": True,
@@ -718,6 +883,7 @@ def add_source_tool(args: Dict[str, Any]) -> Dict[str, Any]:
         return {"success": False, "error": "Both name and url are required"}
 
     success = source_mgr.add_source(name, url)
+    _invalidate_cache()
 
     return {
         "success": success,
@@ -739,6 +905,7 @@ def remove_source_tool(args: Dict[str, Any]) -> Dict[str, Any]:
         return {"success": False, "error": "name parameter is required"}
 
     success = source_mgr.remove_source(name)
+    _invalidate_cache()
 
     return {
         "success": success,
@@ -760,7 +927,7 @@ def validate_feed_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         import feedparser
-        feed = feedparser.parse(url)
+        feed = feedparser.parse(feed_fetcher.download_feed(url))
 
         is_valid = not feed.bozo
         feed_title: str = getattr(feed.feed, 'title', 'Unknown')
@@ -786,7 +953,13 @@ def validate_feed_tool(args: Dict[str, Any]) -> Dict[str, Any]:
 # TOOL REGISTRY
 # ============================================================================
 
-TOOLS = {
+# Parameter schemas shared by several tools (one object, referenced inline)
+ARTICLE_ID_PARAM = {"type": "integer", "description": "Article ID"}
+MIN_RELEVANCE_PARAM = {"type": "number", "minimum": 0.0, "maximum": 1.0, "description": "Minimum relevance score"}
+
+# Tool definitions: function, description, JSON Schema parameters and an
+# optional read_only flag. Frozen into TOOLS below.
+_TOOL_DEFINITIONS: Dict[str, Dict[str, Any]] = {
     # Feedback & Analysis
     "save_feedback": {
         "function": save_feedback_tool,
@@ -794,7 +967,7 @@ TOOLS = {
         "parameters": {
             "type": "object",
             "properties": {
-                "article_id": {"type": "integer", "description": "Article ID"},
+                "article_id": ARTICLE_ID_PARAM,
                 "rating": {"type": "integer", "minimum": 1, "maximum": 5, "description": "Rating from 1-5"},
                 "note": {"type": "string", "description": "Optional note about the rating"}
             },
@@ -803,6 +976,7 @@ TOOLS = {
     },
     "analyze_reading_patterns": {
         "function": analyze_reading_patterns_tool,
+        "read_only": True,
         "description": "Analyze user's reading habits, patterns, and topic evolution over specified time period",
         "parameters": {
             "type": "object",
@@ -813,6 +987,7 @@ TOOLS = {
     },
     "get_feedback_summary": {
         "function": get_feedback_summary_tool,
+        "read_only": True,
         "description": "List recent feedback history with ratings and notes",
         "parameters": {
             "type": "object",
@@ -824,11 +999,12 @@ TOOLS = {
     },
     "compare_ai_vs_user": {
         "function": compare_ai_vs_user_rating_tool,
+        "read_only": True,
         "description": "Compare AI's relevance prediction with user's actual rating for a specific article",
         "parameters": {
             "type": "object",
             "properties": {
-                "article_id": {"type": "integer", "description": "Article ID"}
+                "article_id": ARTICLE_ID_PARAM
             },
             "required": ["article_id"]
         }
@@ -851,7 +1027,7 @@ TOOLS = {
         "parameters": {
             "type": "object",
             "properties": {
-                "article_id": {"type": "integer", "description": "Article ID"}
+                "article_id": ARTICLE_ID_PARAM
             },
             "required": ["article_id"]
         }
@@ -873,18 +1049,20 @@ TOOLS = {
     },
     "get_articles": {
         "function": get_articles_tool,
-        "description": "Get articles with flexible filtering. NEVER marks as read automatically - use mark_articles_read() afterward if user wants that. Supports grouped mode where ALL matching articles are organized into 3 presentation tiers by relevance (not filtered!). IMPORTANT: You MUST specify limit explicitly based on intent: use 1000 for 'show all', 50 for sampling, 10 for quick preview.",
+        "read_only": True,
+        "description": "Get articles with flexible filtering. NEVER marks as read automatically - use mark_articles_read() afterward if user wants that. Supports grouped mode where ALL matching articles are organized into 3 presentation tiers by relevance (not filtered!) - grouped results are in articles_by_tier, with article_ids listing all ids in sort order. IMPORTANT: You MUST specify limit explicitly based on intent: use 1000 for 'show all', 50 for sampling, 10 for quick preview.",
         "parameters": {
             "type": "object",
             "properties": {
                 "read_status": {"type": "string", "enum": ["all", "read", "unread"], "description": "Filter by read status", "default": "all"},
                 "source": {"type": "string", "description": "Partial source name (case-insensitive)"},
-                "min_relevance": {"type": "number", "minimum": 0.0, "maximum": 1.0, "description": "Minimum relevance score"},
+                "min_relevance": MIN_RELEVANCE_PARAM,
                 "time_filter": {"type": "string", "enum": ["last_24h", "last_week", "last_month"], "description": "Time filter"},
                 "fetched_since": {"type": "string", "description": "ISO timestamp for fetched after"},
                 "published_since": {"type": "string", "description": "ISO timestamp for published after"},
                 "limit": {"type": "integer", "description": "Max articles to return (1000 for all, 50 for sample, 10 for preview)"},
                 "offset": {"type": "integer", "description": "Offset for pagination", "default": 0},
+                "after": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2, "description": "Next page for sort_by=relevance_desc: [relevance_score, id] of the last article on the previous page (use instead of offset)"},
                 "sort_by": {"type": "string", "enum": ["relevance_desc", "date_desc", "date_asc"], "description": "Sort order", "default": "relevance_desc"},
                 "grouped": {"type": "boolean", "description": "Group by relevance tiers", "default": False}
             },
@@ -893,13 +1071,14 @@ TOOLS = {
     },
     "search_articles": {
         "function": search_articles_tool,
+        "read_only": True,
         "description": "Search for articles by text query in title, content, or summary",
         "parameters": {
             "type": "object",
             "properties": {
                 "query": {"type": "string", "description": "Search term"},
                 "search_in": {"type": "string", "enum": ["title", "content", "summary", "all"], "description": "Where to search", "default": "all"},
-                "min_relevance": {"type": "number", "minimum": 0.0, "maximum": 1.0, "description": "Minimum relevance score"},
+                "min_relevance": MIN_RELEVANCE_PARAM,
                 "limit": {"type": "integer", "description": "Max results (50 for thorough, 20 for quick)"}
             },
             "required": ["query", "limit"]
@@ -907,11 +1086,12 @@ TOOLS = {
     },
     "get_article": {
         "function": get_article_details_tool,
+        "read_only": True,
         "description": "Retrieve complete details for a single article by ID including content, feedback, and deep_analysis if available",
         "parameters": {
             "type": "object",
             "properties": {
-                "article_id": {"type": "integer", "description": "Article ID"},
+                "article_id": ARTICLE_ID_PARAM,
                 "include_deep_analysis": {"type": "boolean", "description": "Include deep analysis", "default": True}
             },
             "required": ["article_id"]
@@ -919,6 +1099,7 @@ TOOLS = {
     },
     "trigger_deep_analysis": {
         "function": trigger_deep_analysis_tool,
+        "read_only": True,
         "description": "Get deep analysis prompt for ANY article (step 1 of 2). Works for all articles - uses source-specific analysis prompt if configured in sources.json (e.g., Cornucopia for Lars Wilderäng's analyses), otherwise generates a prompt based on user's interests. Returns a prompt that the agent should execute and then save with save_deep_analysis().",
         "parameters": {
             "type": "object",
@@ -934,7 +1115,7 @@ TOOLS = {
         "parameters": {
             "type": "object",
             "properties": {
-                "article_id": {"type": "integer", "description": "Article ID"},
+                "article_id": ARTICLE_ID_PARAM,
                 "analysis_text": {"type": "string", "description": "The deep analysis text in markdown format"}
             },
             "required": ["article_id", "analysis_text"]
@@ -953,6 +1134,40 @@ TOOLS = {
             "required": ["article_id", "summary", "relevance_score"]
         }
     },
+    "save_article_analyses": {
+        "function": save_article_analyses_tool,
+        "description": "Save analyses (summary + relevance score) for MANY articles in one transaction. Use instead of calling save_article_analysis repeatedly - accumulate results and flush in chunks of up to 100.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "description": "Analyses to save",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "article_id": ARTICLE_ID_PARAM,
+                            "summary": {"type": "string", "description": "Swedish summary of the article (2-3 sentences)"},
+                            "relevance_score": {"type": "number", "minimum": 0.0, "maximum": 1.0, "description": "Relevance score (0.0-1.0)"}
+                        },
+                        "required": ["article_id", "summary", "relevance_score"]
+                    },
+                    "maxItems": 100
+                }
+            },
+            "required": ["items"]
+        }
+    },
+    "analyze_unread_batch": {
+        "function": analyze_unread_batch_tool,
+        "description": "Summarize, score and save a batch of unanalyzed articles in ONE call. PRIMARY TOOL for the analyzer agent - replaces calling save_article_analysis once per article. Returns counts per relevance tier, failed IDs and deep_analysis_ids (articles from deep-analysis sources). Call repeatedly until remaining_unanalyzed is 0.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "max_articles": {"type": "integer", "minimum": 1, "maximum": 1000, "description": "Max articles to analyze in this batch", "default": 100}
+            }
+        }
+    },
     "mark_all_read": {
         "function": mark_all_read_tool,
         "description": "Mark ALL unread articles as read in one operation. Simple, zero-parameter tool. Use when user says 'mark all as read' or 'clear all unread' or has read articles externally.",
@@ -977,6 +1192,7 @@ TOOLS = {
     },
     "get_profile": {
         "function": get_reader_profile_tool,
+        "read_only": True,
         "description": "Retrieve user's current interest profile including all topics, weights, and top interests",
         "parameters": {}
     },
@@ -1018,16 +1234,19 @@ TOOLS = {
     # Statistics & Insights
     "get_stats": {
         "function": get_reading_stats_tool,
+        "read_only": True,
         "description": "Get overview of reading statistics: total articles, unread count, feedback summary, and learning progress",
         "parameters": {}
     },
     "get_source_prefs": {
         "function": get_source_preferences_tool,
+        "read_only": True,
         "description": "Analyze and compare RSS sources by user ratings to identify highest/lowest quality sources",
         "parameters": {}
     },
     "trending_topics": {
         "function": identify_trending_topics_tool,
+        "read_only": True,
         "description": "Discover trending topics from recently published articles over specified time period",
         "parameters": {
             "type": "object",
@@ -1038,6 +1257,7 @@ TOOLS = {
     },
     "suggest_sources": {
         "function": suggest_new_sources_tool,
+        "read_only": True,
         "description": "Get personalized RSS source recommendations based on current interest profile",
         "parameters": {}
     },
@@ -1045,6 +1265,7 @@ TOOLS = {
     # Source Management
     "list_sources": {
         "function": list_sources_tool,
+        "read_only": True,
         "description": "List all available RSS sources. IMPORTANT: Use this FIRST when user mentions a specific source name (e.g., 'SVT Inrikes') to discover exact source names before filtering articles",
         "parameters": {
             "type": "object",
@@ -1078,6 +1299,7 @@ TOOLS = {
     },
     "validate_feed": {
         "function": validate_feed_tool,
+        "read_only": True,
         "description": "Test if an RSS feed URL is valid and fetchable before adding it to the system",
         "parameters": {
             "type": "object",
@@ -1088,3 +1310,19 @@ TOOLS = {
         }
     }
 }
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """One registered tool (attribute access instead of nested dict lookups)."""
+    function: Callable[[Dict[str, Any]], Any]
+    description: str
+    parameters: Dict[str, Any]
+    read_only: bool = False
+
+
+# Read-only view: the tool set is fixed at import, and the SDK wrappers built
+# from it are cached per tool set in analyzer/chat
+TOOLS: Mapping[str, ToolSpec] = MappingProxyType(
+    {name: ToolSpec(**spec) for name, spec in _TOOL_DEFINITIONS.items()}
+)
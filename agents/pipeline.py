@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Ingestion pipeline - fetch, analyze and save articles as overlapping stages.
+
+Three worker coroutines connected by bounded queues:
+    fetch_worker   -> feeds are downloaded concurrently, new articles inserted as each arrives
+    analyze_worker -> new articles are summarized + scored (Messages API, concurrent)
+    save_worker    -> analyses are written in bulk transactions
+
+While later feeds are still downloading, articles from the first ones are analyzed
+and earlier results saved - network, LLM and DB I/O overlap instead of running
+as three sequential phases. Blocking core/ calls run in worker threads.
+
+No base classes, no inheritance - just straightforward code.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+
+from agents.article_scorer import DEFAULT_MODEL, score_articles, score_articles_batch
+from agents.mcp_tools import article_mgr, feed_fetcher, profile_mgr, source_mgr
+from core.feed_fetcher import FETCH_WORKERS
+
+console = Console()
+
+# Max items waiting between two stages (backpressure on the faster stage)
+QUEUE_SIZE = 50
+
+# Articles scored per Messages API batch / rows per bulk save
+ANALYZE_BATCH_SIZE = 20
+SAVE_BATCH_SIZE = 100
+
+# End-of-stream marker passed down the queues
+_DONE = None
+
+
+async def fetch_worker(out_queue: asyncio.Queue, stats: Dict[str, Any],
+                       max_articles_per_source: int = 50) -> None:
+    """Fetch every source and queue its newly inserted articles."""
+    semaphore = asyncio.Semaphore(FETCH_WORKERS)
+
+    async def fetch(source: Dict[str, Any]):
+        async with semaphore:
+            return source, await asyncio.to_thread(feed_fetcher.fetch_feed, source, max_articles_per_source)
+
+    # Downloads run concurrently (fetch_feed reports its own errors); saves
+    # happen here one at a time, in completion order, so SQLite has one writer
+    for next_feed in asyncio.as_completed([fetch(s) for s in source_mgr.list_sources()]):
+        source, (articles, response_headers) = await next_feed
+        try:
+            new_articles = await asyncio.to_thread(
+                feed_fetcher.save_articles, articles, source.get('url'), response_headers
+            )
+        except Exception as e:
+            stats['errors'].append(f"Error processing {source.get('name', 'unknown')}: {e}")
+            continue
+
+        stats['total_fetched'] += len(articles)
+        stats['total_new'] += len(new_articles)
+        for article in new_articles:
+            await out_queue.put(article)
+
+    await out_queue.put(_DONE)
+
+
+async def _forward_analyses(articles: List[Dict[str, Any]], analyses: List[Optional[Dict[str, Any]]],
+                            out_queue: asyncio.Queue, stats: Dict[str, Any]) -> None:
+    """Queue (article, analysis) pairs for saving; failed articles go to stats['failed_ids']."""
+    for article, analysis in zip(articles, analyses):
+        if analysis:
+            await out_queue.put((article, analysis))
+        else:
+            stats['failed_ids'].append(article['id'])
+
+
+async def analyze_worker(in_queue: asyncio.Queue, out_queue: asyncio.Queue, stats: Dict[str, Any]) -> None:
+    """Score queued articles in batches and pass (article, analysis) pairs on."""
+    model = article_mgr.config.get('claude_model', DEFAULT_MODEL)
+    max_tokens = int(article_mgr.config.get('max_tokens_per_summary', 300))
+    top_topics = await asyncio.to_thread(profile_mgr.get_top_topics, 10)
+
+    # Message Batches API: one submission once the fetch is done (cheaper,
+    # but the batch can take minutes, so scoring no longer overlaps fetching)
+    if article_mgr.config.get('use_message_batches', False):
+        articles = []
+        while (article := await in_queue.get()) is not _DONE:
+            articles.append(article)
+        analyses = await score_articles_batch(articles, top_topics, model=model, max_tokens=max_tokens)
+        await _forward_analyses(articles, analyses, out_queue, stats)
+        await out_queue.put(_DONE)
+        return
+
+    done = False
+    while not done:
+        # Block for one article, then take whatever else is already waiting
+        batch = [await in_queue.get()]
+        while len(batch) < ANALYZE_BATCH_SIZE and not in_queue.empty():
+            batch.append(in_queue.get_nowait())
+
+        if batch[-1] is _DONE:
+            batch.pop()
+            done = True
+        if not batch:
+            continue
+
+        analyses = await score_articles(batch, top_topics, model=model, max_tokens=max_tokens)
+        await _forward_analyses(batch, analyses, out_queue, stats)
+
+    await out_queue.put(_DONE)
+
+
+async def save_worker(in_queue: asyncio.Queue, stats: Dict[str, Any]) -> None:
+    """Write analyses in bulk and collect articles that need deep analysis."""
+    deep_sources = {s['name'] for s in source_mgr.list_sources() if s.get('deep_analysis')}
+    rows = []
+
+    while True:
+        item = await in_queue.get()
+        if item is not _DONE:
+            article, analysis = item
+            rows.append((article['id'], analysis['summary'], analysis['relevance_score']))
+            if article['source_name'] in deep_sources:
+                stats['deep_analysis_ids'].append(article['id'])
+
+        if rows and (item is _DONE or len(rows) >= SAVE_BATCH_SIZE):
+            stats['analyzed_count'] += await asyncio.to_thread(article_mgr.save_analyses, rows)
+            rows = []
+
+        if item is _DONE:
+            return
+
+
+async def run_pipeline(max_articles_per_source: int = 50) -> Dict[str, Any]:
+    """
+    Fetch, analyze and save new articles with overlapping stages.
+
+    Returns:
+        Dict with fetch/analysis counts, failed_ids (for the analyzer agent to
+        retry) and deep_analysis_ids (articles from deep-analysis sources)
+    """
+    stats: Dict[str, Any] = {
+        'total_fetched': 0,
+        'total_new': 0,
+        'analyzed_count': 0,
+        'failed_ids': [],
+        'deep_analysis_ids': [],
+        'errors': []
+    }
+    fetched: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    analyzed: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    _ = await asyncio.gather(
+        fetch_worker(fetched, stats, max_articles_per_source),
+        analyze_worker(fetched, analyzed, stats),
+        save_worker(analyzed, stats)
+    )
+
+    console.print(f"[green]✓[/green] Fetched {stats['total_new']} new articles "
+                  f"({stats['total_fetched']} found), analyzed {stats['analyzed_count']}")
+    if stats['failed_ids']:
+        console.print(f"[yellow]![/yellow] {len(stats['failed_ids'])} articles could not be analyzed")
+    for error in stats['errors']:
+        console.print(f"[red]{error}[/red]")
+
+    return stats
+
@@ -0,0 +1,90 @@
+"""
+Shared Claude Agent SDK tool plumbing for the chat and analyzer agents.
+
+Wraps TOOLS entries (agents/mcp_tools.py) as SDK tools and caches the
+decorated wrappers per tool set, and reads the text of a client's response
+(iter_text).
+
+SDK imports are deferred to the functions that use them - importing the
+agents (e.g. from the scheduler entry point) doesn't pay for them up front.
+"""
+
+import asyncio
+import inspect
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, FrozenSet, List
+
+import orjson
+from rich.console import Console
+
+from agents.mcp_tools import TOOLS
+
+if TYPE_CHECKING:
+    from claude_agent_sdk import ClaudeSDKClient
+
+console = Console()
+
+# NVM-specific configuration (Claude Code CLI + node)
+NVM_NODE_BIN = "/Users/mikaelsjovind/.nvm/versions/node/v22.15.1/bin"
+
+# Decorated SDK tool wrappers, built once per tool set and reused across servers
+_SDK_TOOLS_CACHE: Dict[FrozenSet[str], List[Any]] = {}
+
+
+def make_tool_wrapper(name, func, desc, params, read_only=False):
+    """Wrap a TOOLS entry as an SDK tool that returns compact JSON."""
+    from claude_agent_sdk import tool
+    from mcp.types import ToolAnnotations
+
+    input_schema = params if params else {}
+
+    # readOnlyHint lets the CLI run pure-read tool calls concurrently. Passed by
+    # its wire name: mcp 1.x has only that field, later releases alias it
+    annotations = ToolAnnotations.model_validate({"readOnlyHint": read_only})
+
+    @tool(name, desc, input_schema, annotations=annotations)
+    async def wrapper(args):
+        console.print(f"[dim]🔧 {name}[/dim]")
+        if inspect.iscoroutinefunction(func):
+            result = await func(args)
+        else:
+            # Blocking SQLite/IO tool - run in a worker thread so the event loop
+            # keeps servicing the MCP stream (and concurrent read-only calls)
+            result = await asyncio.to_thread(func, args)
+        # Compact JSON - indentation only costs the model input tokens.
+        # Text is the only channel: the SDK server forwards just "content" and
+        # "is_error" to the CLI, so a "structuredContent" key would be dropped.
+        result_json = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        return {
+            "content": [
+                {"type": "text", "text": result_json}
+            ]
+        }
+    return wrapper
+
+
+def build_sdk_tools(tool_names: List[str]) -> List[Any]:
+    """Build (or reuse) the decorated SDK tools for the given tool names."""
+    key = frozenset(tool_names)
+    if key not in _SDK_TOOLS_CACHE:
+        _SDK_TOOLS_CACHE[key] = [
+            make_tool_wrapper(
+                tool_name,
+                TOOLS[tool_name].function,
+                TOOLS[tool_name].description,
+                TOOLS[tool_name].parameters,
+                TOOLS[tool_name].read_only
+            )
+            for tool_name in tool_names
+        ]
+    return _SDK_TOOLS_CACHE[key]
+
+
+async def iter_text(client: "ClaudeSDKClient") -> AsyncIterator[str]:
+    """Yield the text blocks of the current response as they arrive."""
+    from claude_agent_sdk import AssistantMessage, TextBlock
+
+    async for message in client.receive_response():
+        if isinstance(message, AssistantMessage):
+            for block in message.content:
+                if isinstance(block, TextBlock):
+                    yield block.text
@@ -1,9 +1,56 @@
 """Article management and analysis data access."""
 
 import json
-from typing import Any, Dict, List, Optional
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from core.config import read_config
 from core.database import Database
+from core.source_manager import SourceManager
+
+# Columns of the articles table (valid fields for get_unanalyzed_articles)
+ARTICLE_COLUMNS = frozenset({
+    'id', 'url', 'title', 'content', 'summary', 'deep_analysis', 'source_name',
+    'published_date', 'fetched_date', 'relevance_score', 'is_read', 'created_at'
+})
+
+# Article content included in a deep analysis prompt
+DEEP_ANALYSIS_MAX_CHARS = 10000
+
+# query_articles_advanced() SELECT lists. The lite list computes the deep
+# analysis flag in the same query (the text itself stays out).
+_SELECT_STATS = "SELECT COUNT(*) as total_count"
+_SELECT_FULL = "SELECT a.*"
+_SELECT_LITE = ("SELECT a.id, a.url, a.title, a.source_name, a.published_date, a.fetched_date, "
+                "a.relevance_score, a.is_read, a.summary, a.created_at, "
+                "a.deep_analysis IS NOT NULL AS has_deep_analysis")
+
+# query_articles_advanced() sort_by -> ORDER BY clause
+_SORT_MAPPING = {
+    "relevance_desc": "a.relevance_score DESC NULLS LAST, a.id",
+    "relevance_asc": "a.relevance_score ASC NULLS LAST",
+    "published_desc": "a.published_date DESC NULLS LAST",
+    "published_asc": "a.published_date ASC NULLS LAST",
+    "fetched_desc": "a.fetched_date DESC",
+    "fetched_asc": "a.fetched_date ASC",
+    "title": "a.title ASC",
+    "source": "a.source_name ASC, a.published_date DESC",
+    # Names used by the get_articles tool schema
+    "date_desc": "a.published_date DESC NULLS LAST",
+    "date_asc": "a.published_date ASC NULLS LAST"
+}
+
+
+def _days_ago(days: int) -> str:
+    """ISO date N days back. Stored ISO timestamps from that day compare >= it,
+    so `column < _days_ago(n)` matches whole days and can use an index."""
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+def _fts_match(columns: List[str], text: str) -> str:
+    """FTS5 MATCH expression: text as one quoted phrase, limited to columns."""
+    phrase = text.replace('"', '""')
+    return f'{{{" ".join(columns)}}} : "{phrase}"'
 
 
 class ArticleManager:
@@ -13,19 +60,22 @@ class ArticleManager:
     Does NOT make direct API calls - only data access.
     """
 
-    def __init__(self, db: Optional[Database] = None, config_file: str = "config.json"):
+    def __init__(self, db: Optional[Database] = None, config_file: str = "config.json",
+                 source_mgr: Optional[SourceManager] = None):
         self.db = db or Database()
         self.config = self._load_config(config_file)
+        # Shared with the tools when given, so source changes are seen here too
+        self.source_mgr = source_mgr or SourceManager()
+        self._profile_mgr = None
 
     def _load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from JSON file."""
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return read_config(config_file)
         except FileNotFoundError:
             print(f"Warning: {config_file} not found, using defaults")
             return {}
-        except json.JSONDecodeError:
+        except ValueError:
             print(f"Warning: {config_file} is not valid JSON, using defaults")
             return {}
 
@@ -39,6 +89,42 @@ class ArticleManager:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_article_with_feedback(self, article_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a single article plus its feedback (newest first) in one query.
+
+        Returns:
+            Article dict with a 'feedback' list, or None if not found
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("""
+                SELECT a.*,
+                       f.id AS feedback_id, f.rating AS feedback_rating,
+                       f.note AS feedback_note, f.created_at AS feedback_created_at
+                FROM articles a
+                LEFT JOIN feedback f ON f.article_id = a.id
+                WHERE a.id = ?
+                ORDER BY f.created_at DESC
+            """, (article_id,))
+            rows = cursor.fetchall()
+
+        if not rows:
+            return None
+
+        article = {k: rows[0][k] for k in rows[0].keys() if not k.startswith('feedback_')}
+        article['feedback'] = [
+            {
+                'id': row['feedback_id'],
+                'article_id': article_id,
+                'rating': row['feedback_rating'],
+                'note': row['feedback_note'],
+                'created_at': row['feedback_created_at']
+            }
+            for row in rows if row['feedback_id'] is not None
+        ]
+        return article
+
     def get_articles(self,
                     limit: Optional[int] = None,
                     min_relevance: Optional[float] = None,
@@ -74,13 +160,38 @@ class ArticleManager:
                 params.append(limit)
 
             _ = cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in cursor]
+
+    def mark_as_read(self, article_id: int) -> Optional[str]:
+        """
+        Mark an article as read.
+
+        Returns:
+            The article title, or None if the article doesn't exist
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("UPDATE articles SET is_read = 1 WHERE id = ? RETURNING title", (article_id,))
+            row = cursor.fetchone()
+            return row['title'] if row else None
+
+    def mark_many_as_read(self, article_ids: List[int]) -> int:
+        """
+        Mark several articles as read in one transaction.
 
-    def mark_as_read(self, article_id: int):
-        """Mark an article as read."""
+        Returns:
+            Number of articles marked as read
+        """
+        count = 0
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            _ = cursor.execute("UPDATE articles SET is_read = 1 WHERE id = ?", (article_id,))
+            # Chunked to stay under SQLite's host parameter limit
+            for start in range(0, len(article_ids), 900):
+                chunk = article_ids[start:start + 900]
+                placeholders = ','.join('?' * len(chunk))
+                _ = cursor.execute(f"UPDATE articles SET is_read = 1 WHERE id IN ({placeholders})", chunk)
+                count += cursor.rowcount
+        return count
 
     def mark_all_as_read(self) -> int:
         """
@@ -94,15 +205,36 @@ class ArticleManager:
             _ = cursor.execute("UPDATE articles SET is_read = 1 WHERE is_read = 0")
             return cursor.rowcount
 
+    def count_by_source(self) -> Dict[str, int]:
+        """Get the number of stored articles per source name."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("""
+                SELECT source_name, article_count
+                FROM article_counts
+                WHERE article_count > 0
+            """)
+            return {row['source_name']: row['article_count'] for row in cursor}
+
     def cleanup_old_articles(self, days: int = 30) -> int:
         """Remove articles older than specified days."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             _ = cursor.execute("""
                 DELETE FROM articles
-                WHERE date(fetched_date) < date('now', '-' || ? || ' days')
-            """, (days,))
-            return cursor.rowcount
+                WHERE fetched_date < ?
+            """, (_days_ago(days),))
+            deleted = cursor.rowcount
+
+            _ = cursor.execute("""
+                DELETE FROM article_topics
+                WHERE article_id NOT IN (SELECT id FROM articles)
+            """)
+            _ = cursor.execute("""
+                DELETE FROM article_topics_indexed
+                WHERE article_id NOT IN (SELECT id FROM articles)
+            """)
+            return deleted
 
     # ===== Advanced Query Operations =====
 
@@ -112,6 +244,7 @@ class ArticleManager:
                                # Pagination
                                limit: Optional[int] = None,
                                offset: int = 0,
+                               after: Optional[Tuple[float, int]] = None,
                                # Sources
                                source: Optional[str] = None,
                                sources: Optional[List[str]] = None,
@@ -145,23 +278,35 @@ class ArticleManager:
         Advanced article query with flexible filtering and sorting.
 
         All parameters are optional. Returns articles matching all specified criteria.
+
+        For deep pages with sort_by="relevance_desc", pass after=(relevance_score, id)
+        of the last article of the previous page instead of an offset: the next
+        page is then an index seek rather than skipping offset rows. Articles
+        without a relevance score are not reachable this way.
         """
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
 
             # Build SELECT clause
             if stats_only:
-                select_clause = "SELECT COUNT(*) as total_count"
+                select_clause = _SELECT_STATS
             elif include_content:
-                select_clause = "SELECT a.*"
+                select_clause = _SELECT_FULL
             else:
-                select_clause = "SELECT a.id, a.url, a.title, a.source_name, a.published_date, a.fetched_date, a.relevance_score, a.is_read, a.summary, a.created_at"
+                select_clause = _SELECT_LITE
+
+            # Feedback per article as a JSON array (newest first), in the same query
+            if include_feedback and not stats_only:
+                select_clause += """,
+                    (SELECT json_group_array(json_object('rating', rating, 'note', note, 'created_at', created_at))
+                     FROM (SELECT rating, note, created_at FROM feedback
+                           WHERE article_id = a.id ORDER BY created_at DESC)) AS feedback_json"""
 
             # Base query
             query = f"{select_clause} FROM articles a"
 
-            # Add joins for feedback queries
-            if with_feedback is not None or min_rating is not None or controversial is not None or include_feedback:
+            # Add joins for feedback filters
+            if with_feedback is not None or min_rating is not None:
                 query += " LEFT JOIN feedback f ON a.id = f.article_id"
 
             # Build WHERE clause
@@ -205,8 +350,8 @@ class ArticleManager:
 
             # Temporal filters
             if last_n_days is not None:
-                conditions.append("date(a.published_date) >= date('now', '-' || ? || ' days')")
-                params.append(last_n_days)
+                conditions.append("a.published_date >= ?")
+                params.append(_days_ago(last_n_days))
 
             if published_after:
                 conditions.append("a.published_date >= ?")
@@ -224,8 +369,14 @@ class ArticleManager:
                 conditions.append("a.fetched_date <= ?")
                 params.append(fetched_before)
 
-            # Text search
-            if search_query:
+            # Text search - through the trigram full-text index. Trigrams need
+            # at least 3 characters, so shorter terms fall back to LIKE.
+            search_columns = [col for col in ("title", "content", "summary")
+                              if search_in in ("all", col)]
+            if search_query and len(search_query) >= 3 and search_columns:
+                conditions.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+                params.append(_fts_match(search_columns, search_query))
+            elif search_query:
                 search_conditions = []
                 if search_in in ["all", "title"]:
                     search_conditions.append("a.title LIKE ?")
@@ -240,7 +391,10 @@ class ArticleManager:
                 if search_conditions:
                     conditions.append(f"({' OR '.join(search_conditions)})")
 
-            if exclude_query:
+            if exclude_query and len(exclude_query) >= 3:
+                conditions.append("a.id NOT IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+                params.append(_fts_match(["title", "content"], exclude_query))
+            elif exclude_query:
                 conditions.append("(a.title NOT LIKE ? AND (a.content NOT LIKE ? OR a.content IS NULL))")
                 params.extend([f"%{exclude_query}%", f"%{exclude_query}%"])
 
@@ -256,19 +410,25 @@ class ArticleManager:
                 params.append(min_rating)
 
             if controversial is not None:
-                # Controversial articles have mixed ratings (variance > threshold)
-                # This requires a subquery
+                # Controversial articles have mixed ratings (variance > threshold).
+                # Correlated per article, so only candidate rows' feedback is
+                # aggregated (a range scan on idx_feedback_article)
                 if controversial:
                     conditions.append("""
-                        a.id IN (
-                            SELECT article_id
-                            FROM feedback
-                            GROUP BY article_id
-                            HAVING COUNT(*) >= 3 AND
-                                   (MAX(rating) - MIN(rating)) >= 3
-                        )
+                        (SELECT COUNT(*) >= 3 AND MAX(rating) - MIN(rating) >= 3
+                         FROM feedback WHERE article_id = a.id)
                     """)
 
+            # Keyset pagination (matches the relevance_desc ordering below)
+            keyset = False
+            if after is not None and sort_by == "relevance_desc":
+                keyset = True
+                after_score, after_id = float(after[0]), int(after[1])
+                # id ascending within a score, matching the index order
+                # (relevance_score DESC, rowid) - no extra sort step
+                conditions.append("a.relevance_score <= ? AND (a.relevance_score < ? OR a.id > ?)")
+                params.extend([after_score, after_score, after_id])
+
             # Apply WHERE clause
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
@@ -284,18 +444,7 @@ class ArticleManager:
                 query += " GROUP BY a.id"
 
             # ORDER BY
-            sort_mapping = {
-                "relevance_desc": "a.relevance_score DESC NULLS LAST",
-                "relevance_asc": "a.relevance_score ASC NULLS LAST",
-                "published_desc": "a.published_date DESC NULLS LAST",
-                "published_asc": "a.published_date ASC NULLS LAST",
-                "fetched_desc": "a.fetched_date DESC",
-                "fetched_asc": "a.fetched_date ASC",
-                "title": "a.title ASC",
-                "source": "a.source_name ASC, a.published_date DESC"
-            }
-
-            order_clause = sort_mapping.get(sort_by, "a.published_date DESC")
+            order_clause = _SORT_MAPPING.get(sort_by, "a.published_date DESC")
             query += f" ORDER BY {order_clause}"
 
             # LIMIT and OFFSET
@@ -303,38 +452,17 @@ class ArticleManager:
                 query += " LIMIT ?"
                 params.append(limit)
 
-            if offset > 0:
+            if offset > 0 and not keyset:
                 query += " OFFSET ?"
                 params.append(offset)
 
             # Execute query
             _ = cursor.execute(query, params)
-            articles = [dict(row) for row in cursor.fetchall()]
-
-            # Add feedback if requested
-            if include_feedback and articles:
-                article_ids = [a['id'] for a in articles]
-                placeholders = ','.join('?' * len(article_ids))
-                _ = cursor.execute(f"""
-                    SELECT article_id, rating, note, created_at
-                    FROM feedback
-                    WHERE article_id IN ({placeholders})
-                    ORDER BY created_at DESC
-                """, article_ids)
-
-                feedback_by_article = {}
-                for row in cursor.fetchall():
-                    aid = row['article_id']
-                    if aid not in feedback_by_article:
-                        feedback_by_article[aid] = []
-                    feedback_by_article[aid].append({
-                        'rating': row['rating'],
-                        'note': row['note'],
-                        'created_at': row['created_at']
-                    })
+            articles = [dict(row) for row in cursor]
 
+            if include_feedback:
                 for article in articles:
-                    article['feedback'] = feedback_by_article.get(article['id'], [])
+                    article['feedback'] = json.loads(article.pop('feedback_json'))
 
             # Group by source if requested
             if group_by == "source":
@@ -350,24 +478,53 @@ class ArticleManager:
 
     # ===== Analysis-Specific Queries =====
 
-    def get_unanalyzed_articles(self) -> List[Dict[str, Any]]:
+    def get_unanalyzed_articles(self, limit: Optional[int] = None,
+                                fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all articles that don't have summaries yet.
 
+        Args:
+            limit: Optional maximum number of articles to return
+            fields: Optional article columns to return (default: all)
+
         Returns:
             List of unanalyzed articles
         """
+        if fields:
+            unknown = set(fields) - ARTICLE_COLUMNS
+            if unknown:
+                raise ValueError(f"Unknown article fields: {', '.join(sorted(unknown))}")
+            columns = ', '.join(fields)
+        else:
+            columns = '*'
+
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            _ = cursor.execute("""
-                SELECT * FROM articles
+            query = f"""
+                SELECT {columns} FROM articles
                 WHERE summary IS NULL OR relevance_score IS NULL
                 ORDER BY fetched_date DESC
-            """)
-            articles = [dict(row) for row in cursor.fetchall()]
+            """
+            params = []
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+
+            _ = cursor.execute(query, params)
+            articles = [dict(row) for row in cursor]
 
         return articles
 
+    def count_unanalyzed_articles(self) -> int:
+        """Count articles that don't have summaries yet (same filter as get_unanalyzed_articles)."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("""
+                SELECT COUNT(*) as count FROM articles
+                WHERE summary IS NULL OR relevance_score IS NULL
+            """)
+            return cursor.fetchone()['count']
+
     def get_deep_analysis_prompt(self, article: Dict[str, Any], analysis_description: Optional[str] = None) -> tuple[Optional[str], bool]:
         """
         Generate a prompt for deep article analysis.
@@ -382,18 +539,17 @@ class ArticleManager:
 
         # Get analysis description from sources.json via source manager
         if not analysis_description:
-            from core.source_manager import SourceManager
-            source_mgr = SourceManager()
-            source_config = next((s for s in source_mgr.sources if s.get('name') == source_name), None)
+            source_config = self.source_mgr.get_source(source_name)
 
             if source_config and source_config.get('deep_analysis'):
                 analysis_description = source_config.get('analysis_description')
 
         # If no source-specific description, generate fallback based on user profile
         if not analysis_description:
-            from core.profile_manager import ProfileManager
-            profile_mgr = ProfileManager(db=self.db)
-            user_interests = profile_mgr.get_analysis_interests(limit=8)
+            if self._profile_mgr is None:
+                from core.profile_manager import ProfileManager
+                self._profile_mgr = ProfileManager(db=self.db)
+            user_interests = self._profile_mgr.get_analysis_interests(limit=8)
 
             analysis_description = f"""Gör en djupgående analys av artikeln med fokus på aspekter som är relevanta för läsarens intressen: {user_interests}.
 
@@ -412,7 +568,7 @@ Var konkret och citerar relevanta delar från artikeln."""
 
 ARTIKEL:
 Titel: {article.get('title', '')}
-Innehåll: {article.get('content', '')[:10000]}
+Innehåll: {(article.get('content') or '')[:DEEP_ANALYSIS_MAX_CHARS]}
 
 ANALYSINSTRUKTION:
 {analysis_description}
@@ -421,7 +577,7 @@ Skriv din analys i tydlig, välstrukturerad markdown-format med rubriker och cit
 
         return prompt, is_fallback
 
-    def save_deep_analysis(self, article_id: int, analysis_text: str) -> bool:
+    def save_deep_analysis(self, article_id: int, analysis_text: str) -> Optional[str]:
         """
         Save deep analysis for an article.
 
@@ -430,7 +586,7 @@ Skriv din analys i tydlig, välstrukturerad markdown-format med rubriker och cit
             analysis_text: The deep analysis text (markdown format)
 
         Returns:
-            True if saved successfully
+            The article title, or None if the article doesn't exist
         """
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -438,10 +594,12 @@ Skriv din analys i tydlig, välstrukturerad markdown-format med rubriker och cit
                 UPDATE articles
                 SET deep_analysis = ?
                 WHERE id = ?
+                RETURNING title
             """, (analysis_text, article_id))
-            return cursor.rowcount > 0
+            row = cursor.fetchone()
+            return row['title'] if row else None
 
-    def save_analysis(self, article_id: int, summary: str, relevance_score: float) -> bool:
+    def save_analysis(self, article_id: int, summary: str, relevance_score: float) -> Optional[str]:
         """
         Save article analysis (summary and relevance score).
 
@@ -451,7 +609,7 @@ Skriv din analys i tydlig, välstrukturerad markdown-format med rubriker och cit
             relevance_score: Relevance score (0.0-1.0)
 
         Returns:
-            True if saved successfully
+            The article title, or None if the article doesn't exist
         """
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -459,5 +617,29 @@ Skriv din analys i tydlig, välstrukturerad markdown-format med rubriker och cit
                 UPDATE articles
                 SET summary = ?, relevance_score = ?
                 WHERE id = ?
+                RETURNING title
             """, (summary, relevance_score, article_id))
-            return cursor.rowcount > 0
+            row = cursor.fetchone()
+            return row['title'] if row else None
+
+    def save_analyses(self, items: List[Tuple[int, str, float]]) -> int:
+        """
+        Save many article analyses in a single transaction.
+
+        Args:
+            items: List of (article_id, summary, relevance_score) tuples
+
+        Returns:
+            Number of articles updated
+        """
+        if not items:
+            return 0
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.executemany("""
+                UPDATE articles
+                SET summary = ?, relevance_score = ?
+                WHERE id = ?
+            """, [(summary, score, article_id) for article_id, summary, score in items])
+            return cursor.rowcount
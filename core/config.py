@@ -0,0 +1,69 @@
+"""Shared config.json loading and atomic JSON writes.
+
+The parsed config is cached per file and modification time, so every
+manager and agent reads the file once and sees changes after it is saved.
+"""
+
+import functools
+import os
+import stat
+import tempfile
+from typing import Any, Dict
+
+import orjson
+
+# os.umask can only be read by setting it; done once at import rather than
+# while other threads may be creating files
+_UMASK = os.umask(0)
+_ = os.umask(_UMASK)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config(config_file: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file (cached per path and modification time)."""
+    with open(config_file, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def read_config(config_file: str = "config.json") -> Dict[str, Any]:
+    """
+    Load a config file, re-reading it only when the file has changed.
+
+    The returned dict is shared by all callers - copy it before changing it.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        orjson.JSONDecodeError: If the file is not valid JSON (a ValueError)
+    """
+    return _read_config(config_file, os.stat(config_file).st_mtime_ns)
+
+
+def load_config(config_file: str = "config.json") -> Dict[str, Any]:
+    """Like read_config, but returns {} when the file is missing or invalid."""
+    try:
+        return read_config(config_file)
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+
+def save_json(data: Any, path: str) -> None:
+    """Write a JSON file (config.json, sources.json) atomically.
+
+    Written to a temp file in the same directory and renamed over path, so
+    readers never see a half-written file. Keeps the file's permissions
+    (mkstemp creates 0600); a new file gets the umask default.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            _ = f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -8,36 +8,87 @@ All CRUD operations belong in feature-based managers.
 """
 
 import sqlite3
+import threading
 from contextlib import contextmanager
-from typing import Generator
+from typing import Dict, Generator, Optional
 
 
 class Database:
-    """Minimal SQLite connection manager - connection and schema only."""
+    """Minimal SQLite connection manager - connection and schema only.
+
+    One instance per database path: every Database("news.db") in the process
+    shares the same object, so the schema setup only runs once.
+
+    Each thread keeps its connection open and reuses it (tools run in worker
+    threads), so a tool call doesn't pay for opening the database file.
+    """
+
+    _instances: Dict[str, "Database"] = {}
+
+    def __new__(cls, db_path: str = "news.db"):
+        instance = cls._instances.get(db_path)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instances[db_path] = instance
+        return instance
 
     def __init__(self, db_path: str = "news.db"):
+        if getattr(self, '_initialized', False):
+            return
         self.db_path = db_path
+        self._local = threading.local()
         self.init_database()
+        self._initialized = True
 
     @contextmanager
     def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for database connections.
+
+        Nested blocks in the same thread share the outer transaction: commit
+        or rollback happens when the outermost block exits.
+        """
+        local = self._local
+        conn: Optional[sqlite3.Connection] = getattr(local, 'conn', None)
+        if conn is None:
+            # timeout doubles as busy_timeout: wait up to 5 s for another writer
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            # Per-connection tuning. synchronous=NORMAL is safe under WAL (a
+            # crash can lose the last commits, never corrupt the database)
+            _ = conn.execute("PRAGMA synchronous=NORMAL")
+            _ = conn.execute("PRAGMA temp_store=MEMORY")
+            _ = conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+            _ = conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            local.conn = conn
+            local.depth = 0
+
+        local.depth += 1
         try:
             yield conn
-            conn.commit()
+            if local.depth == 1:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if local.depth == 1:
+                conn.rollback()
             raise
         finally:
+            local.depth -= 1
+
+    def close(self) -> None:
+        """Close this thread's connection (others close when their thread exits)."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            del self._local.conn
 
     def init_database(self) -> None:
         """Initialize database schema."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL lets readers run concurrently with a writer (tools run in threads)
+            _ = cursor.execute("PRAGMA journal_mode=WAL")
+
             # Articles table
             _ = cursor.execute("""
                 CREATE TABLE IF NOT EXISTS articles (
@@ -80,7 +131,186 @@ class Database:
                 )
             """)
 
+            # Reader profile change counter, bumped by triggers on every profile
+            # write. ProfileManager compares it before serving its cached
+            # profile, so writes from other processes (chat, Slack bot,
+            # scheduler) are seen on the next read
+            _ = cursor.execute("""
+                CREATE TABLE IF NOT EXISTS profile_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            _ = cursor.execute("INSERT OR IGNORE INTO profile_version (id, version) VALUES (1, 0)")
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                _ = cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS profile_version_{event.lower()}
+                    AFTER {event} ON reader_profile BEGIN
+                        UPDATE profile_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
+
+            # Article topics table (profile topics matched at ingest, for trending)
+            _ = cursor.execute("""
+                CREATE TABLE IF NOT EXISTS article_topics (
+                    article_id INTEGER NOT NULL,
+                    topic TEXT NOT NULL,
+                    PRIMARY KEY (article_id, topic),
+                    FOREIGN KEY (article_id) REFERENCES articles (id)
+                )
+            """)
+
+            # Articles already matched against the current profile topics. A new
+            # topic empties it, so get_trending_topics re-matches lazily; a
+            # removed topic needs nothing (its rows are filtered by the join)
+            _ = cursor.execute("""
+                CREATE TABLE IF NOT EXISTS article_topics_indexed (
+                    article_id INTEGER PRIMARY KEY,
+                    FOREIGN KEY (article_id) REFERENCES articles (id)
+                )
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS article_topics_new_topic AFTER INSERT ON reader_profile BEGIN
+                    DELETE FROM article_topics_indexed;
+                END
+            """)
+
+            # Feed cache table (HTTP validators for conditional feed fetches)
+            _ = cursor.execute("""
+                CREATE TABLE IF NOT EXISTS feed_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    updated_at TEXT
+                )
+            """)
+
+            # Article count per source (kept in sync by triggers), so the
+            # per-source counts don't group the whole articles table
+            _ = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_counts'")
+            counts_exist = cursor.fetchone() is not None
+            _ = cursor.execute("""
+                CREATE TABLE IF NOT EXISTS article_counts (
+                    source_name TEXT PRIMARY KEY,
+                    article_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS article_counts_insert AFTER INSERT ON articles BEGIN
+                    INSERT INTO article_counts (source_name, article_count)
+                    VALUES (new.source_name, 1)
+                    ON CONFLICT(source_name) DO UPDATE SET article_count = article_count + 1;
+                END
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS article_counts_delete AFTER DELETE ON articles BEGIN
+                    UPDATE article_counts SET article_count = article_count - 1
+                    WHERE source_name = old.source_name;
+                END
+            """)
+            if not counts_exist:
+                # Count articles stored before the table existed
+                _ = cursor.execute("""
+                    INSERT INTO article_counts (source_name, article_count)
+                    SELECT source_name, COUNT(*) FROM articles GROUP BY source_name
+                """)
+
+            # Feedback summary per source (kept in sync by triggers), so
+            # source preferences don't aggregate the whole feedback table
+            _ = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'feedback_summary'")
+            summary_exists = cursor.fetchone() is not None
+            _ = cursor.execute("""
+                CREATE TABLE IF NOT EXISTS feedback_summary (
+                    source_name TEXT PRIMARY KEY,
+                    feedback_count INTEGER NOT NULL DEFAULT 0,
+                    rating_sum INTEGER NOT NULL DEFAULT 0,
+                    positive_count INTEGER NOT NULL DEFAULT 0,
+                    negative_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS feedback_summary_insert AFTER INSERT ON feedback BEGIN
+                    INSERT INTO feedback_summary
+                        (source_name, feedback_count, rating_sum, positive_count, negative_count)
+                    SELECT source_name, 1, new.rating, new.rating >= 4, new.rating <= 2
+                    FROM articles WHERE id = new.article_id
+                    ON CONFLICT(source_name) DO UPDATE SET
+                        feedback_count = feedback_count + 1,
+                        rating_sum = rating_sum + excluded.rating_sum,
+                        positive_count = positive_count + excluded.positive_count,
+                        negative_count = negative_count + excluded.negative_count;
+                END
+            """)
+            # Feedback on removed articles no longer counts (as with the join it replaces)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS feedback_summary_article_delete AFTER DELETE ON articles
+                WHEN EXISTS (SELECT 1 FROM feedback WHERE article_id = old.id) BEGIN
+                    UPDATE feedback_summary SET
+                        feedback_count = feedback_count
+                            - (SELECT COUNT(*) FROM feedback WHERE article_id = old.id),
+                        rating_sum = rating_sum
+                            - (SELECT SUM(rating) FROM feedback WHERE article_id = old.id),
+                        positive_count = positive_count
+                            - (SELECT COUNT(*) FROM feedback WHERE article_id = old.id AND rating >= 4),
+                        negative_count = negative_count
+                            - (SELECT COUNT(*) FROM feedback WHERE article_id = old.id AND rating <= 2)
+                    WHERE source_name = old.source_name;
+                END
+            """)
+            if not summary_exists:
+                # Summarize feedback given before the table existed
+                _ = cursor.execute("""
+                    INSERT INTO feedback_summary
+                        (source_name, feedback_count, rating_sum, positive_count, negative_count)
+                    SELECT a.source_name, COUNT(*), SUM(f.rating),
+                           SUM(f.rating >= 4), SUM(f.rating <= 2)
+                    FROM feedback f
+                    JOIN articles a ON f.article_id = a.id
+                    GROUP BY a.source_name
+                """)
+
+            # Full-text index over articles for search. The trigram tokenizer
+            # matches substrings (like the LIKE '%q%' it replaces), which also
+            # finds parts of Swedish compound words. Kept in sync by triggers.
+            _ = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'")
+            fts_exists = cursor.fetchone() is not None
+            _ = cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, content, summary,
+                    content='articles', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, title, content, summary)
+                    VALUES (new.id, new.title, new.content, new.summary);
+                END
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, content, summary)
+                    VALUES ('delete', old.id, old.title, old.content, old.summary);
+                END
+            """)
+            _ = cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS articles_fts_update
+                AFTER UPDATE OF title, content, summary ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, content, summary)
+                    VALUES ('delete', old.id, old.title, old.content, old.summary);
+                    INSERT INTO articles_fts (rowid, title, content, summary)
+                    VALUES (new.id, new.title, new.content, new.summary);
+                END
+            """)
+            if not fts_exists:
+                # Index articles stored before the search index existed
+                _ = cursor.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
             # Create indexes
+            _ = cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_article_topics_topic
+                ON article_topics(topic)
+            """)
             _ = cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_articles_published
                 ON articles(published_date DESC)
@@ -89,7 +319,33 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_articles_relevance
                 ON articles(relevance_score DESC)
             """)
+            # Source filtering; also covers the get_stats aggregates and the
+            # per-source counts, so those scan the index instead of the table
+            # (whose rows carry the article content)
+            _ = cursor.execute("DROP INDEX IF EXISTS idx_articles_source")
+            _ = cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_source_stats
+                ON articles(source_name, relevance_score, is_read)
+            """)
+
+            # Compound/partial indexes for the common article queries
+            _ = cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_unread_relevance
+                ON articles(is_read, relevance_score DESC)
+            """)
+            _ = cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_fetched
+                ON articles(fetched_date DESC)
+            """)
+            _ = cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_unanalyzed
+                ON articles(fetched_date DESC)
+                WHERE summary IS NULL OR relevance_score IS NULL
+            """)
             _ = cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_articles_source
-                ON articles(source_name)
+                CREATE INDEX IF NOT EXISTS idx_feedback_article
+                ON feedback(article_id, rating)
             """)
+
+            # Refresh planner statistics where they are missing or stale
+            _ = cursor.execute("PRAGMA optimize")
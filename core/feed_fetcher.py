@@ -1,23 +1,68 @@
 """RSS feed fetching and parsing."""
 
-import sqlite3
+import functools
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urlunparse
 
-import feedparser
-
 from core.database import Database
+from core.profile_manager import ProfileManager
 from core.source_manager import SourceManager
 
+# feedparser and requests are imported where they're used: every tool module
+# imports this one, but only fetching and feed validation need them
+if TYPE_CHECKING:
+    import requests
+
+# Upper bound for a downloaded feed body; larger feeds are rejected
+MAX_FEED_BYTES = 2 * 1024 * 1024
+FEED_TIMEOUT_SECONDS = 5
+
+# Limits for scheduled fetches (full-content feeds can be large and slow)
+MAX_FETCH_BYTES = 16 * 1024 * 1024
+FETCH_TIMEOUT_SECONDS = 15
+
+# Feeds downloaded in parallel by fetch_all()
+FETCH_WORKERS = 16
+
+
+@functools.lru_cache(maxsize=4096)
+def _strip_url_extras(url: str) -> str:
+    """URL without params, query and fragment (cached - feeds repeat links every poll)."""
+    try:
+        parsed = urlparse(url)
+        # Reconstruct URL without query params and fragment
+        return urlunparse((
+            parsed.scheme,
+            parsed.netloc,
+            parsed.path,
+            '',  # params (empty)
+            '',  # query (empty)
+            ''   # fragment (empty)
+        ))
+    except Exception:
+        # If parsing fails, return original URL
+        return url
+
 
 class FeedFetcher:
     """Fetches and parses RSS feeds."""
 
-    def __init__(self, db: Optional[Database] = None):
+    def __init__(self, db: Optional[Database] = None, source_mgr: Optional[SourceManager] = None):
         self.db = db or Database()
-        self.source_mgr = SourceManager()
+        self.source_mgr = source_mgr or SourceManager()
+        self.profile_mgr = ProfileManager(db=self.db)
+        self._session: Optional["requests.Session"] = None
+
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session reused across downloads (connection pooling, gzip by default)."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
 
     def _normalize_url(self, url: str) -> str:
         """Normalize URL by removing query parameters and fragments.
@@ -28,21 +73,14 @@ class FeedFetcher:
         if not url:
             return url
 
-        try:
-            parsed = urlparse(url)
-            # Reconstruct URL without query params and fragment
-            normalized = urlunparse((
-                parsed.scheme,
-                parsed.netloc,
-                parsed.path,
-                '',  # params (empty)
-                '',  # query (empty)
-                ''   # fragment (empty)
-            ))
-            return normalized
-        except Exception:
-            # If parsing fails, return original URL
-            return url
+        # For http(s) links, cutting at '#' and '?' gives what urlparse would
+        # (params only exist after a ';' in the path, left to the full parse)
+        if url.startswith(('http://', 'https://')):
+            base = url.partition('#')[0].partition('?')[0]
+            if ';' not in base:
+                return base
+
+        return _strip_url_extras(url)
 
     def _parse_date(self, date_str: Optional[Any]) -> Optional[str]:
         """Parse and normalize date from feed."""
@@ -73,18 +111,94 @@ class FeedFetcher:
 
         return ""
 
-    def fetch_feed(self, source: Dict[str, str], max_articles: int = 50) -> List[Dict[str, Any]]:
-        """Fetch and parse a single RSS feed."""
+    def _request_feed(self, url: str, max_bytes: int, timeout: float,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """GET a feed, streaming so oversized feeds are cut off early.
+
+        Returns:
+            Tuple of (status_code, lowercased response headers, body)
+
+        Raises:
+            requests.RequestException: On connection errors or 4xx/5xx status
+            ValueError: If the body is larger than max_bytes
+        """
+        with self.session.get(url, timeout=timeout, stream=True, headers=headers) as response:
+            response.raise_for_status()
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body.extend(chunk)
+                if len(body) > max_bytes:
+                    raise ValueError(f"Feed is larger than {max_bytes // (1024 * 1024)} MiB")
+
+            return response.status_code, response_headers, bytes(body)
+
+    def download_feed(self, url: str, max_bytes: int = MAX_FEED_BYTES) -> bytes:
+        """Download a feed body (see _request_feed for errors)."""
+        return self._request_feed(url, max_bytes, FEED_TIMEOUT_SECONDS)[2]
+
+    def _get_feed_validators(self, url: str) -> Dict[str, str]:
+        """Conditional GET headers from the last successful fetch of url."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("SELECT etag, last_modified FROM feed_cache WHERE url = ?", (url,))
+            row = cursor.fetchone()
+
+        headers = {}
+        if row and row['etag']:
+            headers['If-None-Match'] = row['etag']
+        if row and row['last_modified']:
+            headers['If-Modified-Since'] = row['last_modified']
+        return headers
+
+    def _save_feed_validators(self, url: str, response_headers: Dict[str, str]) -> None:
+        """Remember ETag/Last-Modified so the next fetch can be conditional."""
+        etag = response_headers.get('etag')
+        last_modified = response_headers.get('last-modified')
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            if etag or last_modified:
+                _ = cursor.execute("""
+                    INSERT INTO feed_cache (url, etag, last_modified, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        etag = excluded.etag,
+                        last_modified = excluded.last_modified,
+                        updated_at = excluded.updated_at
+                """, (url, etag, last_modified, datetime.now().isoformat()))
+            else:
+                _ = cursor.execute("DELETE FROM feed_cache WHERE url = ?", (url,))
+
+    def fetch_feed(self, source: Dict[str, str],
+                   max_articles: int = 50) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, str]]]:
+        """Fetch and parse a single RSS feed.
+
+        Returns:
+            Tuple of (articles, response headers). The headers are None when
+            nothing was downloaded; pass them to save_articles, which stores
+            the feed's validators together with its articles.
+        """
         name = source.get('name', 'Unknown')
         url = source.get('url')
 
         if not url:
             print(f"Warning: Source '{name}' has no URL")
-            return []
+            return [], None
 
         try:
+            import feedparser
+
             print(f"Fetching {name}...")
-            feed = feedparser.parse(url)
+            # Conditional GET: an unchanged feed answers 304 and isn't parsed
+            status, response_headers, body = self._request_feed(
+                url, MAX_FETCH_BYTES, FETCH_TIMEOUT_SECONDS, self._get_feed_validators(url)
+            )
+            if status == 304:
+                print(f"  {name} unchanged since last fetch")
+                return [], None
+
+            feed = feedparser.parse(body, response_headers=response_headers)
 
             if feed.bozo:
                 print(f"Warning: Feed parsing error for {name}: {feed.bozo_exception}")
@@ -104,11 +218,62 @@ class FeedFetcher:
                     articles.append(article)
 
             print(f"  Found {len(articles)} articles from {name}")
-            return articles
+            return articles, response_headers
 
         except Exception as e:
             print(f"Error fetching {name}: {e}")
-            return []
+            return [], None
+
+    def save_articles(self, articles: List[Dict[str, Any]], feed_url: Optional[str] = None,
+                      response_headers: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Save fetched articles to database, skipping duplicate URLs.
+
+        With feed_url and response_headers (from fetch_feed), the feed's
+        ETag/Last-Modified are saved in the same transaction - a failed save
+        leaves the old validators, so the next poll downloads the feed again.
+
+        Returns:
+            The newly inserted articles, each with its database 'id'
+        """
+        fetched_date = datetime.now().isoformat()
+        rows = [(a['url'], a['title'], a['content'], a['source_name'], a['published_date'], fetched_date)
+                for a in articles]
+        urls = list({a['url'] for a in articles})
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Duplicate URLs are skipped by the UNIQUE constraint
+            _ = cursor.executemany("""
+                INSERT OR IGNORE INTO articles
+                (url, title, content, source_name, published_date, fetched_date)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            # Rows inserted by this call are the ones carrying its fetched_date
+            new_ids = {}
+            if cursor.rowcount:
+                for start in range(0, len(urls), 900):  # SQLite variable limit
+                    chunk = urls[start:start + 900]
+                    placeholders = ','.join('?' * len(chunk))
+                    _ = cursor.execute(f"""
+                        SELECT id, url FROM articles
+                        WHERE url IN ({placeholders}) AND fetched_date = ?
+                    """, (*chunk, fetched_date))
+                    new_ids.update((row['url'], row['id']) for row in cursor.fetchall())
+
+            if feed_url and response_headers is not None:
+                self._save_feed_validators(feed_url, response_headers)
+
+        # First occurrence of each new URL, in feed order
+        new_articles = [
+            {**article, 'id': new_ids.pop(article['url']), 'fetched_date': fetched_date}
+            for article in articles if article['url'] in new_ids
+        ]
+
+        # Match profile topics once at ingest (used by trending topics)
+        _ = self.profile_mgr.index_article_topics(new_articles)
+
+        return new_articles
 
     def fetch_all(self, max_articles_per_source: int = 50) -> Dict[str, Any]:
         """Fetch all RSS feeds and save to database."""
@@ -119,32 +284,24 @@ class FeedFetcher:
         total_new = 0
         errors = []
 
-        for source in sources:
-            try:
-                articles = self.fetch_feed(source, max_articles_per_source)
-                total_fetched += len(articles)
-
-                # Save to database
-                for article in articles:
-                    with self.db.get_connection() as conn:
-                        cursor = conn.cursor()
-                        try:
-                            _ = cursor.execute("""
-                                INSERT INTO articles
-                                (url, title, content, source_name, published_date, fetched_date)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (article['url'], article['title'], article['content'],
-                                  article['source_name'], article['published_date'],
-                                  datetime.now().isoformat()))
-                            total_new += 1
-                        except sqlite3.IntegrityError:
-                            # Article already exists (duplicate URL)
-                            pass
-
-            except Exception as e:
-                error_msg = f"Error processing {source.get('name', 'unknown')}: {e}"
-                errors.append(error_msg)
-                print(f"  {error_msg}")
+        # Downloads run in parallel (network-bound, the GIL is released while
+        # waiting); saving stays on this thread so SQLite has a single writer
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(sources) or 1)) as executor:
+            futures = {
+                executor.submit(self.fetch_feed, source, max_articles_per_source): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    articles, response_headers = future.result()
+                    total_fetched += len(articles)
+                    total_new += len(self.save_articles(articles, source.get('url'), response_headers))
+
+                except Exception as e:
+                    error_msg = f"Error processing {source.get('name', 'unknown')}: {e}"
+                    errors.append(error_msg)
+                    print(f"  {error_msg}")
 
         result = {
             'total_fetched': total_fetched,
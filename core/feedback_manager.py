@@ -1,9 +1,9 @@
 """Feedback management and statistics."""
 
-import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from core.config import load_config, read_config, save_json
 from core.database import Database
 
 
@@ -12,17 +12,7 @@ class FeedbackManager:
 
     def __init__(self, db: Optional[Database] = None, config_file: str = "config.json"):
         self.db = db or Database()
-        self.config = self._load_config(config_file)
-
-    def _load_config(self, config_file: str) -> Dict[str, Any]:
-        """Load configuration from JSON file."""
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-        except json.JSONDecodeError:
-            return {}
+        self.config = load_config(config_file)
 
     # ===== Feedback Operations =====
 
@@ -47,7 +37,7 @@ class FeedbackManager:
                 WHERE article_id = ?
                 ORDER BY created_at DESC
             """, (article_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in cursor]
 
     def get_feedback_stats(self) -> Dict[str, Any]:
         """Get feedback statistics for learning."""
@@ -80,24 +70,13 @@ class FeedbackManager:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             _ = cursor.execute("""
-                SELECT a.title, a.source_name, f.rating, f.note, f.created_at
+                SELECT a.title, a.source_name AS source, f.rating, f.note, f.created_at AS date
                 FROM feedback f
                 JOIN articles a ON f.article_id = a.id
                 ORDER BY f.created_at DESC
                 LIMIT ?
             """, (limit,))
-
-            feedback_list = []
-            for row in cursor.fetchall():
-                feedback_list.append({
-                    'title': row['title'],
-                    'source': row['source_name'],
-                    'rating': row['rating'],
-                    'note': row['note'],
-                    'date': row['created_at']
-                })
-
-        return feedback_list
+            return [dict(row) for row in cursor]
 
     def get_source_preferences(self) -> List[Dict[str, Any]]:
         """
@@ -110,25 +89,14 @@ class FeedbackManager:
             cursor = conn.cursor()
             _ = cursor.execute("""
                 SELECT
-                    a.source_name,
-                    AVG(f.rating) as avg_rating,
-                    COUNT(*) as feedback_count
-                FROM feedback f
-                JOIN articles a ON f.article_id = a.id
-                GROUP BY a.source_name
-                HAVING feedback_count >= 2
+                    source_name as source,
+                    rating_sum * 1.0 / feedback_count as avg_rating,
+                    feedback_count
+                FROM feedback_summary
+                WHERE feedback_count >= 2
                 ORDER BY avg_rating DESC
             """)
-
-            preferences = []
-            for row in cursor.fetchall():
-                preferences.append({
-                    'source': row['source_name'],
-                    'avg_rating': row['avg_rating'],
-                    'feedback_count': row['feedback_count']
-                })
-
-        return preferences
+            return [dict(row) for row in cursor]
 
     # ===== General Statistics =====
 
@@ -137,46 +105,30 @@ class FeedbackManager:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
 
-            # Article stats
+            # Article, source and feedback totals in one statement
             _ = cursor.execute("""
                 SELECT
                     COUNT(*) as total_articles,
                     SUM(CASE WHEN is_read = 0 THEN 1 ELSE 0 END) as unread_count,
-                    SUM(CASE WHEN relevance_score >= 0.6 THEN 1 ELSE 0 END) as relevant_count
-                FROM articles
-            """)
-            article_stats = dict(cursor.fetchone())
-
-            # Feedback stats
-            _ = cursor.execute("""
-                SELECT
-                    COUNT(*) as total_feedback,
-                    AVG(rating) as avg_rating
-                FROM feedback
-            """)
-            feedback_stats = dict(cursor.fetchone())
-
-            # Source stats
-            _ = cursor.execute("""
-                SELECT
-                    COUNT(DISTINCT source_name) as source_count
+                    SUM(CASE WHEN relevance_score >= 0.6 THEN 1 ELSE 0 END) as relevant_count,
+                    COUNT(DISTINCT source_name) as source_count,
+                    (SELECT COUNT(*) FROM feedback) as total_feedback,
+                    (SELECT AVG(rating) FROM feedback) as avg_rating
                 FROM articles
             """)
-            source_stats = dict(cursor.fetchone())
+            totals = dict(cursor.fetchone())
 
             # Articles by source
             _ = cursor.execute("""
-                SELECT source_name, COUNT(*) as count
-                FROM articles
-                GROUP BY source_name
-                ORDER BY count DESC
+                SELECT source_name, article_count
+                FROM article_counts
+                WHERE article_count > 0
+                ORDER BY article_count DESC
             """)
-            articles_by_source = {row['source_name']: row['count'] for row in cursor.fetchall()}
+            articles_by_source = {row['source_name']: row['article_count'] for row in cursor}
 
             return {
-                **article_stats,
-                **feedback_stats,
-                **source_stats,
+                **totals,
                 'articles_by_source': articles_by_source
             }
 
@@ -191,41 +143,24 @@ class FeedbackManager:
         """
         feedback_stats = self.get_feedback_stats()
 
-        # Get source preferences from database
+        # Source preferences and AI accuracy in one connection block
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            _ = cursor.execute("""
-                SELECT
-                    a.source_name,
-                    AVG(f.rating) as avg_rating,
-                    COUNT(*) as count
-                FROM feedback f
-                JOIN articles a ON f.article_id = a.id
-                GROUP BY a.source_name
-                HAVING count >= 2
-                ORDER BY avg_rating DESC
-            """)
-            source_prefs = {row['source_name']: row['avg_rating'] for row in cursor.fetchall()}
+            # Same query as get_source_preferences (the nested block shares conn), keyed by source
+            source_prefs = {p['source']: p['avg_rating'] for p in self.get_source_preferences()}
 
-        # Calculate AI accuracy (discrepancies between AI scores and user ratings)
-        with self.db.get_connection() as conn:
+            # Calculate AI accuracy (discrepancies between AI scores and user ratings)
             cursor = conn.cursor()
             _ = cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM feedback f
-                JOIN articles a ON f.article_id = a.id
-                WHERE a.relevance_score IS NOT NULL
-            """)
-            total_with_scores = cursor.fetchone()['total']
-
-            _ = cursor.execute("""
-                SELECT COUNT(*) as discrepancies
+                SELECT
+                    COUNT(*) as total,
+                    COALESCE(SUM(CASE WHEN ABS(a.relevance_score - (f.rating / 5.0)) > 0.3 THEN 1 ELSE 0 END), 0) as discrepancies
                 FROM feedback f
                 JOIN articles a ON f.article_id = a.id
                 WHERE a.relevance_score IS NOT NULL
-                AND ABS(a.relevance_score - (f.rating / 5.0)) > 0.3
             """)
-            discrepancies = cursor.fetchone()['discrepancies']
+            row = cursor.fetchone()
+            total_with_scores = row['total']
+            discrepancies = row['discrepancies']
 
         accuracy_rate = 1.0 if total_with_scores == 0 else 1 - (discrepancies / total_with_scores)
 
@@ -259,17 +194,12 @@ class FeedbackManager:
             return False
 
         try:
-            # Reload config to ensure we have latest
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            config["relevance_threshold"] = threshold
-
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # Latest config from disk (cached unless the file changed)
+            config = {**read_config(config_file), "relevance_threshold": threshold}
+            save_json(config, config_file)
 
             # Update instance config
-            self.config["relevance_threshold"] = threshold
+            self.config = config
             return True
         except Exception as e:
             print(f"Error saving threshold: {e}")
@@ -1,11 +1,25 @@
 """User profile management and learning system."""
 
-import json
+import threading
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from core.config import load_config
 from core.database import Database
 
+# Reader profile per database path, shared by every ProfileManager in the
+# process. It is read on nearly every agent turn but rarely changes, so it is
+# loaded once and dropped by the profile writes (update_topic, remove_topic).
+# The chat CLI, Slack bot and scheduler are separate processes writing the
+# same profile, so an entry is also reloaded when the profile_version
+# counter (bumped by triggers on reader_profile) has moved.
+_profile_cache: Dict[str, Dict[str, Any]] = {}
+_profile_cache_lock = threading.Lock()
+
+# Very common Swedish words that don't help topic matching. Words like
+# "svensk", "politik", "teknik" are kept as they are meaningful.
+TOPIC_STOP_WORDS = frozenset({"och", "eller", "med", "för", "av", "på", "i", "samt", "en", "ett", "den", "det", "om"})
+
 
 class ProfileManager:
     """Manages and learns user's reading profile over time."""
@@ -15,14 +29,6 @@ class ProfileManager:
         self.config_path = config_path
         self._init_default_topics()
 
-    def _load_config(self) -> Dict:
-        """Load config.json file."""
-        try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
     def _init_default_topics(self):
         """Initialize profile with topics from config.json if empty."""
         with self.db.get_connection() as conn:
@@ -30,7 +36,7 @@ class ProfileManager:
             _ = cursor.execute("SELECT COUNT(*) as count FROM reader_profile")
             if cursor.fetchone()['count'] == 0:
                 # Load topics from config.json
-                config = self._load_config()
+                config = load_config(self.config_path)
                 user_interests = config.get('user_interests', {})
                 topics = user_interests.get('topics', [])
                 priorities = user_interests.get('priorities', {})
@@ -41,6 +47,7 @@ class ProfileManager:
                 low_priority = priorities.get('low', [])
 
                 # Add topics with appropriate weights
+                items = []
                 for topic in topics:
                     if topic in high_priority:
                         weight = 0.8
@@ -51,12 +58,53 @@ class ProfileManager:
                     else:
                         weight = 0.7  # Default for topics not in priority lists
 
-                    _ = self.update_topic(topic, weight, "explicit")
+                    items.append((topic, weight, "explicit"))
+
+                if items:
+                    _ = self.update_topics_bulk(items)
 
     # ===== Profile Access =====
 
+    def _invalidate_profile(self) -> None:
+        """Drop the cached profile for this database (call after profile writes)."""
+        with _profile_cache_lock:
+            _ = _profile_cache.pop(self.db.db_path, None)
+
+    def _cached_profile(self) -> Dict[str, Any]:
+        """Cache entry with 'profile', 'top_topics' (and 'topic_keywords' once built), loading it if needed."""
+        with _profile_cache_lock:
+            # Read before the profile: a write in between only causes a reload later
+            version = self._profile_version()
+            entry = _profile_cache.get(self.db.db_path)
+            if entry is None or entry['version'] != version:
+                profile = self._load_profile()
+                entry = {
+                    'version': version,
+                    'profile': profile,
+                    'top_topics': sorted(
+                        ((topic, data['weight']) for topic, data in profile.items()),
+                        key=lambda x: x[1],
+                        reverse=True
+                    )
+                }
+                _profile_cache[self.db.db_path] = entry
+            return entry
+
     def get_profile(self) -> Dict[str, Dict]:
         """Get the complete reader profile."""
+        # Copies, so callers can't change the cached profile
+        return {topic: dict(data) for topic, data in self._cached_profile()['profile'].items()}
+
+    def _profile_version(self) -> int:
+        """Current value of the reader profile change counter."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("SELECT version FROM profile_version WHERE id = 1")
+            row = cursor.fetchone()
+            return row['version'] if row else 0
+
+    def _load_profile(self) -> Dict[str, Dict]:
+        """Read the reader profile from the database."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             _ = cursor.execute("""
@@ -78,50 +126,80 @@ class ProfileManager:
 
     def get_top_topics(self, limit: int = 10) -> List[Tuple[str, float]]:
         """Get top topics by weight."""
-        profile = self.get_profile()
-        sorted_topics = sorted(
-            profile.items(),
-            key=lambda x: x[1]['weight'],
-            reverse=True
-        )
-
-        return [(topic, data['weight']) for topic, data in sorted_topics[:limit]]
+        return self._cached_profile()['top_topics'][:limit]
 
     # ===== Topic Management =====
 
     def update_topic(self, topic: str, weight: float, source: str = "learned") -> bool:
         """Update or create a topic in the profile."""
-        weight = max(0.0, min(1.0, weight))  # Clamp to 0-1
+        return self.update_topics_bulk([(topic, weight, source)]) > 0
+
+    def update_topics_bulk(self, items: List[Tuple[str, float, str]]) -> int:
+        """
+        Update or create several topics in one transaction.
+
+        Args:
+            items: List of (topic, weight, source) tuples, same semantics as update_topic
+
+        Returns:
+            Number of topics written
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        for topic, weight, source in items:
+            weight = max(0.0, min(1.0, weight))  # Clamp to 0-1
+            rows.append((topic, weight, source, now))
 
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            _ = cursor.execute("""
+            _ = cursor.executemany("""
                 INSERT INTO reader_profile (topic, weight, source, sample_count, last_updated)
                 VALUES (?, ?, ?, 1, ?)
                 ON CONFLICT(topic) DO UPDATE SET
-                    weight = ?,
+                    weight = excluded.weight,
                     sample_count = sample_count + 1,
-                    last_updated = ?
-            """, (topic, weight, source, datetime.now().isoformat(),
-                  weight, datetime.now().isoformat()))
+                    last_updated = excluded.last_updated
+            """, rows)
 
-            return True
+        self._invalidate_profile()
+        return len(rows)
 
     def adjust_topic_weight(self, topic: str, delta: float) -> Optional[float]:
         """Adjust topic weight by delta."""
-        profile = self.get_profile()
+        return self.adjust_topic_weights([topic], delta)[0][1]
 
-        if topic not in profile:
-            # Create new topic with base weight
-            new_weight = 0.5 + delta
-            _ = self.update_topic(topic, new_weight, "learned")
-            return new_weight
+    def adjust_topic_weights(self, topics: List[str], delta: float) -> List[Tuple[str, float]]:
+        """
+        Adjust several topic weights by the same delta in one transaction.
+
+        The change is applied to the stored weight (not a cached one), so
+        feedback learned by another process isn't overwritten.
 
-        current_weight = profile[topic]['weight']
-        new_weight = max(0.0, min(1.0, current_weight + delta))
-        _ = self.update_topic(topic, new_weight, profile[topic]['source'])
+        Returns:
+            List of (topic, new_weight) tuples, in input order
+        """
+        if not topics:
+            return []
 
-        return new_weight
+        now = datetime.now().isoformat()
+        updates = []
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for topic in topics:
+                # New topics start from a base weight of 0.5
+                _ = cursor.execute("""
+                    INSERT INTO reader_profile (topic, weight, source, sample_count, last_updated)
+                    VALUES (?, MIN(1.0, MAX(0.0, 0.5 + ?)), 'learned', 1, ?)
+                    ON CONFLICT(topic) DO UPDATE SET
+                        weight = MIN(1.0, MAX(0.0, weight + ?)),
+                        sample_count = sample_count + 1,
+                        last_updated = excluded.last_updated
+                    RETURNING weight
+                """, (topic, delta, now, delta))
+                updates.append((topic, cursor.fetchone()['weight']))
+
+        self._invalidate_profile()
+        return updates
 
     def remove_topic(self, topic: str) -> bool:
         """
@@ -138,30 +216,43 @@ class ProfileManager:
             _ = cursor.execute("DELETE FROM reader_profile WHERE topic = ?", (topic,))
             deleted = cursor.rowcount > 0
 
+        self._invalidate_profile()
         return deleted
 
     # ===== Topic Extraction =====
 
-    def extract_topics_from_text(self, text: str, title: str = "") -> List[str]:
-        """Extract potential topics from article text by matching against profile topics."""
-        # Combine title and text
-        full_text = f"{title} {text}".lower()
-
-        # Get current profile topics
-        profile = self.get_profile()
+    def _topic_keywords(self) -> Dict[str, List[str]]:
+        """Build keyword mapping from actual profile topics (cached with the profile)."""
+        entry = self._cached_profile()
+        topic_keywords = entry.get('topic_keywords')
+        if topic_keywords is not None:
+            return topic_keywords
 
-        # Build keyword mapping from actual profile topics
         # Each profile topic generates keywords by splitting on common words
         topic_keywords = {}
-        for topic in profile.keys():
+        for topic in entry['profile'].keys():
             # Split topic into keywords (e.g., "Claude och AI-utveckling" -> ["claude", "ai", "utveckling"])
             topic_lower = topic.lower()
-            # Remove ONLY very common Swedish words that don't help matching
-            # Keep words like "svensk", "politik", "teknik" as they are meaningful
-            stop_words = {"och", "eller", "med", "för", "av", "på", "i", "samt", "en", "ett", "den", "det", "om"}
-            keywords = [word for word in topic_lower.split() if word not in stop_words and len(word) > 2]
+            keywords = [word for word in topic_lower.split() if word not in TOPIC_STOP_WORDS and len(word) > 2]
             topic_keywords[topic] = keywords
 
+        # Built from the entry's own profile, so a racing rebuild stores the same mapping
+        entry['topic_keywords'] = topic_keywords
+        return topic_keywords
+
+    def extract_topics_from_text(self, text: str, title: str = "",
+                                 topic_keywords: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """Extract potential topics from article text by matching against profile topics.
+
+        Pass topic_keywords (from _topic_keywords) when extracting for many
+        articles, so the profile is only loaded once.
+        """
+        # Combine title and text
+        full_text = f"{title} {text}".lower()
+
+        if topic_keywords is None:
+            topic_keywords = self._topic_keywords()
+
         # Match topics against text
         found_topics = []
         for topic, keywords in topic_keywords.items():
@@ -171,6 +262,78 @@ class ProfileManager:
 
         return found_topics
 
+    def index_article_topics(self, articles: List[Dict[str, Any]]) -> int:
+        """
+        Store the profile topics each article matches (article_topics table)
+        and mark the articles as indexed, including those matching nothing.
+
+        Args:
+            articles: Articles with 'id', 'title' and 'content'
+
+        Returns:
+            Number of (article, topic) rows written
+        """
+        if not articles:
+            return 0
+
+        topic_keywords = self._topic_keywords()
+        rows = [
+            (article['id'], topic)
+            for article in articles
+            for topic in self.extract_topics_from_text(
+                article.get('content') or '', article.get('title') or '', topic_keywords
+            )
+        ]
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.executemany("""
+                INSERT OR IGNORE INTO article_topics (article_id, topic)
+                VALUES (?, ?)
+            """, rows)
+            _ = cursor.executemany("""
+                INSERT OR IGNORE INTO article_topics_indexed (article_id) VALUES (?)
+            """, [(article['id'],) for article in articles])
+
+        return len(rows)
+
+    def get_trending_topics(self, since_date: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Count current profile topics across articles published since a date.
+
+        Articles not yet matched against the current topics (fetched before
+        article_topics existed, or before an interest was added) are indexed
+        first, so the counts cover the whole window.
+
+        Returns:
+            List of (topic, article_count) tuples, most frequent first
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            _ = cursor.execute("""
+                SELECT id, title, content FROM articles a
+                WHERE published_date >= ?
+                AND NOT EXISTS (SELECT 1 FROM article_topics_indexed i WHERE i.article_id = a.id)
+            """, (since_date,))
+            unindexed = [dict(row) for row in cursor.fetchall()]
+
+        _ = self.index_article_topics(unindexed)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Join reader_profile so removed interests don't keep trending
+            _ = cursor.execute("""
+                SELECT t.topic, COUNT(*) AS count
+                FROM article_topics t
+                JOIN articles a ON a.id = t.article_id
+                JOIN reader_profile p ON p.topic = t.topic
+                WHERE a.published_date >= ?
+                GROUP BY t.topic
+                ORDER BY count DESC
+                LIMIT ?
+            """, (since_date, limit))
+            return [(row['topic'], row['count']) for row in cursor.fetchall()]
+
     # ===== Learning from Feedback =====
 
     def learn_from_feedback(self, article_id: int, rating: int):
@@ -178,7 +341,7 @@ class ProfileManager:
         # Get article details
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            _ = cursor.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
+            _ = cursor.execute("SELECT title, content FROM articles WHERE id = ?", (article_id,))
             row = cursor.fetchone()
             article = dict(row) if row else None
 
@@ -199,13 +362,7 @@ class ProfileManager:
         delta_map = {5: 0.1, 4: 0.05, 3: 0.0, 2: -0.05, 1: -0.1}
         delta = delta_map.get(rating, 0.0)
 
-        updates = []
-        for topic in topics:
-            new_weight = self.adjust_topic_weight(topic, delta)
-            if new_weight is not None:
-                updates.append((topic, new_weight))
-
-        return updates
+        return self.adjust_topic_weights(topics, delta)
 
     # ===== Analysis & Insights =====
 
@@ -1,7 +1,9 @@
 """RSS source management."""
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from core.config import save_json
 
 
 class SourceManager:
@@ -10,6 +12,12 @@ class SourceManager:
     def __init__(self, sources_file: str = "sources.json"):
         self.sources_file = sources_file
         self.sources = self._load_sources()
+        self._index_sources()
+
+    def _index_sources(self) -> None:
+        """Rebuild the name/URL -> source lookups (call after self.sources changes)."""
+        self.sources_by_name: Dict[str, Dict[str, Any]] = {s['name']: s for s in self.sources}
+        self.sources_by_url: Dict[str, Dict[str, Any]] = {s['url']: s for s in self.sources}
 
     def _load_sources(self) -> List[Dict[str, Any]]:
         """Load RSS sources from JSON file."""
@@ -29,17 +37,16 @@ class SourceManager:
         """Add a new RSS source."""
         try:
             # Check if source already exists
-            for source in self.sources:
-                if source['url'] == url:
-                    print(f"Source with URL {url} already exists")
-                    return False
+            if url in self.sources_by_url:
+                print(f"Source with URL {url} already exists")
+                return False
 
             # Add to sources list
             self.sources.append({'name': name, 'url': url})
+            self._index_sources()
 
             # Save to file
-            with open(self.sources_file, 'w', encoding='utf-8') as f:
-                json.dump(self.sources, f, indent=2, ensure_ascii=False)
+            save_json(self.sources, self.sources_file)
 
             print(f"Added source: {name}")
             return True
@@ -53,14 +60,14 @@ class SourceManager:
         try:
             original_count = len(self.sources)
             self.sources = [s for s in self.sources if s['name'] != name]
+            self._index_sources()
 
             if len(self.sources) == original_count:
                 print(f"Source '{name}' not found")
                 return False
 
             # Save to file
-            with open(self.sources_file, 'w', encoding='utf-8') as f:
-                json.dump(self.sources, f, indent=2, ensure_ascii=False)
+            save_json(self.sources, self.sources_file)
 
             print(f"Removed source: {name}")
             return True
@@ -69,6 +76,18 @@ class SourceManager:
             print(f"Error removing source: {e}")
             return False
 
+    def get_source(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a source by exact name."""
+        return self.sources_by_name.get(name)
+
     def list_sources(self) -> List[Dict[str, Any]]:
         """List all RSS sources."""
         return self.sources
+
+    def list_sources_with_counts(self, article_counts: Dict[str, int]) -> List[Dict[str, Any]]:
+        """List all RSS sources with an 'article_count' from article_counts.
+
+        Returns new dicts, so the counts never end up in sources.json.
+        """
+        return [{**source, 'article_count': article_counts.get(source['name'], 0)}
+                for source in self.sources]
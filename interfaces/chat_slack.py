@@ -16,19 +16,34 @@ import asyncio
 import logging
 import os
 import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Set
 
-from claude_agent_sdk import AssistantMessage, TextBlock
+import aiohttp
 from dotenv import load_dotenv
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 from slack_bolt.app.async_app import AsyncApp
 
-from agents.chat import create_chat_client
+from agents.chat import create_chat_client, needs_tool_docs, with_tool_docs
+from agents.mcp_tools import DEBUG
+from agents.sdk_tools import iter_text
+
+if TYPE_CHECKING:
+    from claude_agent_sdk import ClaudeSDKClient
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Markdown -> Slack mrkdwn patterns used by format_for_slack (compiled once).
+# Link text and bold spans stop at a newline, so unbalanced brackets or
+# asterisks in a long reply only make the engine rescan their own line.
+_LINK_RE = re.compile(r'\[([^\]\n]+)\]\(([^)\s]+)\)')
+_BOLD_RE = re.compile(r'\*\*([^*\n]+)\*\*')
+_HEADER_RE = re.compile(r'^#{1,2}[ \t]+(.+)$', re.MULTILINE)
+
+
 def format_for_slack(text: str) -> str:
     """
     Convert markdown-style formatting to Slack mrkdwn format.
@@ -38,15 +53,18 @@ def format_for_slack(text: str) -> str:
     - **bold** → *bold*
     - ## Header → *Header*
     """
+    # Plain prose (most replies) has nothing to convert
+    if '[' not in text and '*' not in text and '#' not in text:
+        return text
+
     # Convert markdown links [text](url) to Slack format <url|text>
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<\2|\1>', text)
+    text = _LINK_RE.sub(r'<\2|\1>', text)
 
     # Convert **bold** to *bold* (Slack uses single asterisks)
-    text = re.sub(r'\*\*([^*]+)\*\*', r'*\1*', text)
+    text = _BOLD_RE.sub(r'*\1*', text)
 
-    # Convert ## headers to *bold* (Slack doesn't have native headers in messages)
-    text = re.sub(r'^##\s+(.+)$', r'*\1*', text, flags=re.MULTILINE)
-    text = re.sub(r'^#\s+(.+)$', r'*\1*', text, flags=re.MULTILINE)
+    # Convert # and ## headers to *bold* (Slack doesn't have native headers in messages)
+    text = _HEADER_RE.sub(r'*\1*', text)
 
     return text
 
@@ -59,8 +77,80 @@ app = AsyncApp(token=os.environ.get("SLACK_BOT_TOKEN"))
 # Security: Only this user can access the bot
 ALLOWED_USER_ID = os.environ.get("SLACK_ALLOWED_USER_ID")
 
-# Store active agent clients per user (in case we expand access later)
-active_clients = {}
+# Bot replies (Swedish, like the agent)
+UNAUTHORIZED_MESSAGE = (
+    "❌ Tyvärr, denna bot är privat och endast tillgänglig för en specifik användare.\n\n"
+    "Om du tror detta är ett fel, kontakta bot-ägaren."
+)
+THINKING_MESSAGE = "🤔 Tänker..."
+GREETING_MESSAGE = "Hej! Jag är din nyhetsassistent. Ställ mig en fråga om dina nyheter!"
+ERROR_MESSAGE = (
+    "❌ Ett fel uppstod: {error}\n\n"
+    "Försök igen eller kontakta administratören om problemet kvarstår."
+)
+
+# Connected agent clients per user (in case we expand access later). A
+# session stays open for the bot's lifetime, so replies don't pay for the
+# SDK startup; the lock keeps overlapping messages off the same session.
+# Least recently used first; sessions beyond MAX_CLIENTS are disconnected.
+MAX_CLIENTS = 16
+active_clients: "OrderedDict[str, ClaudeSDKClient]" = OrderedDict()
+_client_locks: Dict[str, asyncio.Lock] = {}
+# Users whose session history already contains the tool docs
+_tool_docs_sent: Set[str] = set()
+# Pending evict_client tasks
+_evictions: Set["asyncio.Task[None]"] = set()
+
+
+async def ask_agent(user_id: str, message: str) -> str:
+    """Send a message to the user's agent session and return the full reply."""
+    lock = _client_locks.setdefault(user_id, asyncio.Lock())
+    async with lock:
+        client = active_clients.get(user_id)
+        if client is None:
+            logger.info(f"Creating new agent client for user {user_id}")
+            client = create_chat_client()
+            await client.connect()
+            active_clients[user_id] = client
+            if len(active_clients) > MAX_CLIENTS:
+                oldest = next(iter(active_clients))
+                # In its own task: it waits for that user's lock, not ours
+                task = asyncio.create_task(evict_client(oldest))
+                _evictions.add(task)  # the loop only keeps weak references
+                task.add_done_callback(_evictions.discard)
+        else:
+            active_clients.move_to_end(user_id)
+
+        try:
+            # Tool docs are sent once per session - they stay in its history
+            if user_id not in _tool_docs_sent and needs_tool_docs(message):
+                message = with_tool_docs(message)
+                _tool_docs_sent.add(user_id)
+
+            await client.query(message)
+            return "\n".join([chunk async for chunk in iter_text(client)])
+        except Exception:
+            # Start over with a fresh session on the next message
+            await close_client(user_id)
+            raise
+
+
+async def evict_client(user_id: str) -> None:
+    """Disconnect a least recently used session once its current turn is done."""
+    async with _client_locks.setdefault(user_id, asyncio.Lock()):
+        logger.info(f"Closing idle agent client for user {user_id}")
+        await close_client(user_id)
+
+
+async def close_client(user_id: str) -> None:
+    """Disconnect and forget a user's agent session."""
+    client = active_clients.pop(user_id, None)
+    _tool_docs_sent.discard(user_id)
+    if client is not None:
+        try:
+            await client.disconnect()
+        except Exception as e:
+            logger.warning(f"Error disconnecting agent client for user {user_id}: {e}")
 
 
 def is_user_authorized(user_id: str) -> bool:
@@ -71,136 +161,66 @@ def is_user_authorized(user_id: str) -> bool:
     return user_id == ALLOWED_USER_ID
 
 
-@app.event("app_mention")
-async def handle_mention(event, say):
-    """Handle @mentions of the bot."""
-    user_id = event["user"]
-    text = event["text"]
-    channel = event["channel"]
+async def respond(user_id: str, message: str, channel: str, say,
+                  thread_ts: Optional[str] = None, kind: str = "message") -> None:
+    """Check access, run the message through the agent and post the reply.
 
+    kind ("message" or "DM") only labels the log lines.
+    """
     # Security check
     if not is_user_authorized(user_id):
-        logger.warning(f"Unauthorized access attempt by user {user_id}")
-        await say(
-            "❌ Tyvärr, denna bot är privat och endast tillgänglig för en specifik användare.\n\n"
-            "Om du tror detta är ett fel, kontakta bot-ägaren.",
-            thread_ts=event.get("ts")
-        )
-        return
-
-    # Remove bot mention from text
-    message = text.split('>', 1)[1].strip() if '>' in text else text.strip()
-
-    if not message:
-        await say(
-            "Hej! Jag är din nyhetsassistent. Ställ mig en fråga om dina nyheter!",
-            thread_ts=event.get("ts")
-        )
+        logger.warning(f"Unauthorized {kind} attempt by user {user_id}")
+        await say(UNAUTHORIZED_MESSAGE, thread_ts=thread_ts)
         return
 
     try:
-        # Get or create client for this user
-        if user_id not in active_clients:
-            logger.info(f"Creating new agent client for user {user_id}")
-            active_clients[user_id] = create_chat_client()
-
-        client = active_clients[user_id]
-
         # Send "thinking" indicator
-        thinking_msg = await say("🤔 Tänker...", thread_ts=event.get("ts"))
+        thinking_msg = await say(THINKING_MESSAGE, thread_ts=thread_ts)
 
         # Get response from agent
-        async with client:
-            await client.query(message)
-
-            response_text = []
-            async for msg in client.receive_response():
-                if isinstance(msg, AssistantMessage):
-                    for block in msg.content:
-                        if isinstance(block, TextBlock):
-                            response_text.append(block.text)
-
-            response = "\n".join(response_text)
+        response = await ask_agent(user_id, message)
 
         # Format response for Slack (convert markdown links, etc.)
         formatted_response = format_for_slack(response)
 
-        # Delete thinking message and send actual response
-        _ = await app.client.chat_delete(
+        # Replace the thinking message with the actual response
+        _ = await app.client.chat_update(
             channel=channel,
-            ts=thinking_msg["ts"]
+            ts=thinking_msg["ts"],
+            text=formatted_response
         )
-        await say(formatted_response, thread_ts=event.get("ts"))
 
     except Exception as e:
-        logger.error(f"Error processing message: {e}", exc_info=True)
-        await say(
-            f"❌ Ett fel uppstod: {str(e)}\n\n"
-            f"Försök igen eller kontakta administratören om problemet kvarstår.",
-            thread_ts=event.get("ts")
-        )
+        # Full traceback only with NEWS_DEBUG=1 (as for tool errors)
+        logger.error(f"Error processing {kind}: {e}", exc_info=DEBUG)
+        await say(ERROR_MESSAGE.format(error=e), thread_ts=thread_ts)
 
 
-@app.event("message")
-async def handle_message(event, say):
-    """Handle direct messages to the bot."""
-    # Ignore bot messages and threaded messages (handled by mentions)
-    if event.get("subtype") or event.get("thread_ts"):
-        return
-
+@app.event("app_mention")
+async def handle_mention(event, say):
+    """Handle @mentions of the bot."""
     user_id = event["user"]
     text = event["text"]
-    channel = event["channel"]
 
-    # Security check
-    if not is_user_authorized(user_id):
-        logger.warning(f"Unauthorized DM attempt by user {user_id}")
-        await say(
-            "❌ Tyvärr, denna bot är privat och endast tillgänglig för en specifik användare.\n\n"
-            "Om du tror detta är ett fel, kontakta bot-ägaren."
-        )
-        return
-
-    try:
-        # Get or create client for this user
-        if user_id not in active_clients:
-            logger.info(f"Creating new agent client for user {user_id}")
-            active_clients[user_id] = create_chat_client()
+    # Remove bot mention from text (everything up to the first '>')
+    _, sep, rest = text.partition('>')
+    message = (rest if sep else text).strip()
 
-        client = active_clients[user_id]
-
-        # Send "thinking" indicator
-        thinking_msg = await say("🤔 Tänker...")
-
-        # Get response from agent
-        async with client:
-            await client.query(text)
-
-            response_text = []
-            async for msg in client.receive_response():
-                if isinstance(msg, AssistantMessage):
-                    for block in msg.content:
-                        if isinstance(block, TextBlock):
-                            response_text.append(block.text)
+    if not message and is_user_authorized(user_id):
+        await say(GREETING_MESSAGE, thread_ts=event.get("ts"))
+        return
 
-            response = "\n".join(response_text)
+    await respond(user_id, message, event["channel"], say, thread_ts=event.get("ts"))
 
-        # Format response for Slack (convert markdown links, etc.)
-        formatted_response = format_for_slack(response)
 
-        # Delete thinking message and send actual response
-        _ = await app.client.chat_delete(
-            channel=channel,
-            ts=thinking_msg["ts"]
-        )
-        await say(formatted_response)
+@app.event("message")
+async def handle_message(event, say):
+    """Handle direct messages to the bot."""
+    # Ignore bot messages and threaded messages (handled by mentions)
+    if event.get("subtype") or event.get("thread_ts"):
+        return
 
-    except Exception as e:
-        logger.error(f"Error processing DM: {e}", exc_info=True)
-        await say(
-            f"❌ Ett fel uppstod: {str(e)}\n\n"
-            f"Försök igen eller kontakta administratören om problemet kvarstår."
-        )
+    await respond(event["user"], event["text"], event["channel"], say, kind="DM")
 
 
 async def main():
@@ -239,8 +259,21 @@ async def main():
     print(f"✓ Authorized user: {ALLOWED_USER_ID}")
     print("✓ Connecting to Slack via Socket Mode...")
 
+    # One pooled HTTP session for all Web API calls - without it the client
+    # opens a new session (and TLS connection) for every say/chat_update
+    app.client.session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=8),
+        timeout=aiohttp.ClientTimeout(total=app.client.timeout),
+    )
+
     handler = AsyncSocketModeHandler(app, os.environ["SLACK_APP_TOKEN"])
-    await handler.start_async()
+    try:
+        await handler.start_async()
+    finally:
+        # Also runs when asyncio.run() cancels us on Ctrl+C
+        for user_id in list(active_clients):
+            await close_client(user_id)
+        await app.client.session.close()
 
 
 if __name__ == "__main__":
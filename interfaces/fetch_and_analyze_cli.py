@@ -10,32 +10,48 @@ import asyncio
 
 from rich.console import Console
 
-from agents.analyzer import run_analysis
-from core.feed_fetcher import FeedFetcher
+from agents.analyzer import close_analyzer_client, get_analyzer_client, run_analysis
+from agents.mcp_tools import db
+from agents.pipeline import run_pipeline
 
 console = Console()
 
 
+async def fetch_and_analyze():
+    """Run the ingestion pipeline, then let the analyzer agent handle the rest."""
+    # Connect the analyzer agent while fetching, so its startup (CLI spawn,
+    # MCP handshake) overlaps the feed downloads instead of following them
+    warmup = asyncio.create_task(get_analyzer_client())
+    try:
+        # Step 1: Fetch, score and save new articles as overlapping stages
+        console.print("[cyan]Step 1:[/cyan] Fetching and analyzing new articles...")
+        stats = await run_pipeline()
+        console.print()
+
+        # Step 2: Agent retries failed articles, older unanalyzed ones and deep analysis
+        console.print("[cyan]Step 2:[/cyan] Running autonomous analysis...")
+        _ = await warmup
+        return await run_analysis(stats['deep_analysis_ids'])
+    finally:
+        # Let a pending connect finish so the client can be shut down cleanly
+        _ = await asyncio.gather(warmup, return_exceptions=True)
+        await close_analyzer_client()
+
+
 def main():
     """Main entry point for background fetch and analyze."""
     console.print("[bold blue]Background Fetch & Analyze[/bold blue]\n")
 
-    # Step 1: Fetch new articles from all RSS feeds
-    console.print("[cyan]Step 1:[/cyan] Fetching articles from RSS feeds...")
-    fetcher = FeedFetcher()
-    new_count = fetcher.fetch_all()
-    console.print(f"[green]✓[/green] Fetched {new_count} new articles\n")
-
-    # Step 2: Run autonomous analysis
-    console.print("[cyan]Step 2:[/cyan] Running autonomous analysis...")
     try:
-        _ = asyncio.run(run_analysis())
+        _ = asyncio.run(fetch_and_analyze())
     except KeyboardInterrupt:
         console.print("\n\n[yellow]Interrupted[/yellow]")
     except Exception as e:
         console.print(f"\n[red]Error during analysis: {e}[/red]")
         import traceback
         traceback.print_exc()
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
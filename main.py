@@ -10,8 +10,28 @@ from typing import Annotated, Any
 import typer
 from rich.console import Console
 
-from core.article_manager import ArticleManager
-from core.database import Database
+# Core managers are imported inside the commands that use them, so --help
+# and the agent commands don't load the data layer up front
+
+# Written by `init` when there is no config.json yet
+DEFAULT_CONFIG: dict[str, Any] = {
+    "database_path": "news.db",
+    "max_articles_per_source": 50,
+    "fetch_interval_hours": 24,
+    "claude_model": "claude-sonnet-4-5-20250929",
+    "max_tokens_per_summary": 200,
+    "use_message_batches": False,
+    "relevance_threshold": 0.6,
+    "user_interests": {
+        "description": "",
+        "topics": [],
+        "priorities": {
+            "high": [],
+            "medium": [],
+            "low": []
+        }
+    }
+}
 
 app = typer.Typer(help="Intelligent RSS Reader - AI-powered news filtering")
 console = Console()
@@ -22,6 +42,7 @@ def init() -> None:
     """Initialize the database and configuration."""
     console.print("\n[bold blue]Initializing RSS Reader...[/bold blue]\n")
 
+    from core.database import Database
     _ = Database()  # Initialize database (side effect)
     console.print("[green]✓[/green] Database initialized")
 
@@ -37,26 +58,8 @@ def init() -> None:
     if not os.path.exists("config.json"):
         console.print("[yellow]![/yellow] No config.json found, creating default...")
         # Create default config.json
-        import json
-        default_config: dict[str, Any] = {
-            "database_path": "news.db",
-            "max_articles_per_source": 50,
-            "fetch_interval_hours": 24,
-            "claude_model": "claude-sonnet-4-5-20250929",
-            "max_tokens_per_summary": 200,
-            "relevance_threshold": 0.6,
-            "user_interests": {
-                "description": "",
-                "topics": [],
-                "priorities": {
-                    "high": [],
-                    "medium": [],
-                    "low": []
-                }
-            }
-        }
-        with open("config.json", 'w', encoding='utf-8') as f:
-            json.dump(default_config, f, indent=2, ensure_ascii=False)
+        from core.config import save_json
+        save_json(DEFAULT_CONFIG, "config.json")
         console.print("[green]✓[/green] Created default config.json")
     else:
         console.print("[green]✓[/green] config.json found")
@@ -73,6 +76,7 @@ def cleanup(
     days: Annotated[int, typer.Option(help="Remove articles older than N days")] = 30
 ) -> None:
     """Clean up old articles from database."""
+    from core.article_manager import ArticleManager
     article_mgr = ArticleManager()
 
     confirm = typer.confirm(f"Remove articles older than {days} days?")